@@ -0,0 +1,730 @@
+"""Offscreen paint benchmarks for the screensaver widgets.
+
+Runs under the offscreen Qt platform, so no display is needed:
+
+    python bench.py glyphs
+    python bench.py chart-cache
+    python bench.py dismiss
+    python bench.py startup
+    python bench.py mirror
+    python bench.py drift
+    python bench.py shutdown
+    python bench.py fetch --ticks 200
+    python bench.py soak --ticks 1000000
+    python bench.py suite --output after.json --compare before.json
+
+Every benchmark can write its result as JSON (--output) together with the
+Python/Qt versions and git revision, so runs can be compared across versions.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide6
+from PySide6.QtCore import QEvent, QEventLoop, QPoint, Qt, QTimer
+from PySide6.QtGui import QKeyEvent, QPixmap, QRegion
+from PySide6.QtWidgets import QApplication, QWidget
+
+import main
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def summarize(samples):
+    """Median / p90 / p95 / p99 / max of a list of millisecond samples."""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "median_ms": statistics.median(ordered),
+        "p90_ms": percentile(ordered, 0.90),
+        "p95_ms": percentile(ordered, 0.95),
+        "p99_ms": percentile(ordered, 0.99),
+        "max_ms": ordered[-1],
+    }
+
+
+def measure(step, iterations, warmup=10, alloc_iterations=50):
+    """Time step(i) per call, then re-run it under tracemalloc for allocation figures.
+
+    The allocation pass is separate so tracing overhead does not skew the timings.
+    """
+    for i in range(warmup):
+        step(i)
+    samples = []
+    cpu_start = time.process_time()
+    for i in range(iterations):
+        start = time.perf_counter()
+        step(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / iterations
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for i in range(alloc_iterations):
+        step(iterations + i)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = summarize(samples)
+    result.update({
+        "cpu_ms_per_call": cpu_ms,
+        "retained_bytes_per_call": (current - base) / alloc_iterations,
+        "peak_alloc_bytes": peak - base,
+    })
+    return result
+
+
+def synthetic_prices(seed=7, start=560.0, step=0.35):
+    """Deterministic random-walk price stream."""
+    rng = random.Random(seed)
+    price = start
+    while True:
+        price = max(0.01, price + rng.uniform(-step, step))
+        yield price
+
+
+def synthetic_payloads(seed=7, start=560.0):
+    open_price = start
+    for price in synthetic_prices(seed, start):
+        amt = price - open_price
+        yield {
+            "price": f"{price:.2f}",
+            "upAndDownAmt": f"{amt:+.2f}",
+            "upAndDownRate": f"{amt / open_price * 100:+.2f}%",
+        }
+
+
+def render_ms(widget, target):
+    start = time.perf_counter()
+    widget.render(target)
+    return (time.perf_counter() - start) * 1000
+
+
+def lit_pixels(image, top, bottom):
+    """Pixels brighter than mid-grey in rows [top, bottom) of a QImage."""
+    return sum(1 for y in range(top, bottom) for x in range(image.width())
+               if image.pixelColor(x, y).lightness() > 128)
+
+
+def negative_position_check(font_size):
+    """Lit pixels in the top half of a digit rolling below zero, atlas vs drawText.
+
+    Positions between -1 and 0 occur on every 0 -> 9 roll; the incoming digit must be drawn.
+    """
+    results = {}
+    for value in (-0.3, -1.3, -2.7):
+        counts = {}
+        for use_atlas in (False, True):
+            main.RollingDigit.use_glyph_atlas = use_atlas
+            digit = main.RollingDigit(font_size=font_size)
+            digit._value = value
+            target = QPixmap(digit.size())
+            target.fill(Qt.GlobalColor.black)
+            # Without DrawWindowBackground: only the glyphs themselves may light pixels
+            digit.render(target, QPoint(), QRegion(), QWidget.RenderFlag.DrawChildren)
+            image = target.toImage()
+            counts["atlas" if use_atlas else "drawText"] = lit_pixels(image, 0, image.height() // 2)
+        counts["ok"] = counts["atlas"] > 0 and counts["drawText"] > 0
+        results[str(value)] = counts
+    return results
+
+
+@benchmark("glyphs")
+def bench_glyphs(args):
+    """RollingDigit paint time with per-frame drawText vs the cached glyph atlas."""
+    results = {}
+    for use_atlas in (False, True):
+        main.RollingDigit.use_glyph_atlas = use_atlas
+        main.GlyphAtlas.clear()
+        digit = main.RollingDigit(font_size=args.font_size)
+        target = QPixmap(digit.size())
+        target.fill(Qt.GlobalColor.black)
+        samples = []
+        for frame in range(args.frames):
+            # Sweep through every digit the way a roll animation would
+            digit._value = frame * 10.0 / args.frames
+            samples.append(render_ms(digit, target))
+        results["atlas" if use_atlas else "drawText"] = summarize(samples)
+    results["negative_positions"] = negative_position_check(args.font_size)
+    main.RollingDigit.use_glyph_atlas = True
+    results["speedup"] = results["drawText"]["median_ms"] / max(results["atlas"]["median_ms"], 1e-9)
+    return results
+
+
+@benchmark("chart-cache")
+def bench_chart_cache(args):
+    """TrendChart path rebuilds per tick: animated frames vs idle repaints."""
+    chart = main.TrendChart()
+    chart.resize(1600, 300)
+    target = QPixmap(chart.size())
+    anim_frames = 54  # 900ms tween at 60fps
+    idle_repaints = 60
+    price = 560.0
+    for tick in range(args.ticks):
+        price += (-1) ** tick * 0.37
+        chart.addData(price)
+        chart._series_tween.stop()
+        for frame in range(1, anim_frames + 1):
+            chart._t = frame / anim_frames
+            chart.render(target)
+    builds_before_idle = chart.path_builds
+    idle = []
+    for _ in range(idle_repaints):
+        idle.append(render_ms(chart, target))
+    return {
+        "ticks": args.ticks,
+        "path_builds_per_tick": builds_before_idle / args.ticks,
+        "path_builds_idle": chart.path_builds - builds_before_idle,
+        "idle_repaint": summarize(idle),
+    }
+
+
+def run_event_loop(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+@benchmark("dismiss")
+def bench_dismiss(args):
+    """Input-to-exit latency and idle wakeups of the process-wide InputWatcher."""
+    real_exit = main.os._exit
+    main.os._exit = lambda code: None  # Only reached if the worker fails to stop
+    try:
+        windows = [main.ScreenSaverWindow(main.PriceBus()) for _ in range(args.screens)]
+        watcher = main.InputWatcher.instance()
+        run_event_loop(1000)
+        idle_wakeups = watcher.wakeups
+
+        key = QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_Space, Qt.KeyboardModifier.NoModifier)
+        QApplication.sendEvent(windows[-1].windowHandle(), key)
+        # close_and_exit runs synchronously inside sendEvent
+        latency = watcher.exit_latency_ms()
+    finally:
+        main.os._exit = real_exit
+    return {
+        "screens": args.screens,
+        "wakeups_per_second": idle_wakeups,
+        "legacy_wakeups_per_second": 20 * args.screens,  # One 50ms cursor timer per window
+        "input_to_exit_ms": latency,
+    }
+
+
+@benchmark("startup")
+def bench_startup(args):
+    """Cold-start import time and time-to-first-paint of /s, /p and /c in fresh processes."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    env = dict(os.environ, GOLD_SAVER_STARTUP_PROBE="1")
+    # A real /p host: on Windows with a native QPA the preview embeds into this
+    # window exactly as into the Screen Saver settings dialog
+    host = None
+    if sys.platform == "win32" and os.environ.get("QT_QPA_PLATFORM") != "offscreen":
+        from PySide6.QtWidgets import QWidget
+        host = QWidget()
+        host.resize(152, 112)
+        host.show()
+        QApplication.processEvents()
+    results = {}
+    for mode in ("/s", "/p", "/c"):
+        argv = [sys.executable, script, mode]
+        if mode == "/p" and host is not None:
+            argv.append(str(int(host.winId())))
+        runs = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            proc = subprocess.Popen(argv, env=env, stdout=subprocess.PIPE, text=True)
+            # Keep pumping events: the embedded child sends messages to the host window
+            while proc.poll() is None and time.perf_counter() - start < 60:
+                QApplication.processEvents()
+                time.sleep(0.002)
+            out = proc.communicate(timeout=5)[0]
+            wall_ms = (time.perf_counter() - start) * 1000
+            report = json.loads(out.strip().splitlines()[-1])
+            report["process_wall_ms"] = wall_ms
+            runs.append(report)
+        results[mode] = {
+            key: statistics.median(run[key] for run in runs)
+            for key in ("import_ms", "first_paint_ms", "process_wall_ms")
+        }
+        results[mode]["requests_loaded"] = any(run["requests_loaded"] for run in runs)
+        results[mode]["embedded"] = all(run.get("embedded", False) for run in runs)
+    if host is not None:
+        host.close()
+    return results
+
+
+def suite_digit_paint(font_size, iterations):
+    digit = main.RollingDigit(font_size=font_size)
+    target = QPixmap(digit.size())
+
+    def step(i):
+        digit._value = i * 0.137  # Mid-roll positions across all digits
+        digit.render(target)
+    return measure(step, iterations)
+
+
+def suite_number_set(number_cls, digit_count, iterations):
+    number = number_cls(font_size=80)
+    integer_digits = max(1, digit_count - 2)
+    prices = synthetic_prices(start=10 ** (integer_digits - 1) * 5.5, step=10 ** (integer_digits - 3))
+
+    def step(i):
+        number.setValue(f"¥{next(prices):.2f}")
+    return measure(step, iterations)
+
+
+def suite_chart(capacity, width, iterations):
+    chart = main.TrendChart(capacity=capacity)
+    chart.resize(width, 300)
+    prices = synthetic_prices()
+    chart.seed([next(prices) for _ in range(capacity)])
+    target = QPixmap(chart.size())
+
+    def step(i):
+        chart.addData(next(prices))
+        chart._series_tween.stop()
+        chart._t = 0.5  # Paint a mid-tween frame, the expensive case
+        chart.render(target)
+    return measure(step, iterations)
+
+
+def suite_window(width, height, iterations):
+    # Only the 152x112 control-panel thumbnail uses the preview layout
+    preview = (width, height) == (152, 112)
+    window = main.ScreenSaverWindow(main.PriceBus(), is_preview=preview)
+    window.showNormal()
+    window.resize(width, height)
+    QApplication.processEvents()
+    payloads = synthetic_payloads()
+    target = QPixmap(window.size())
+
+    def step(i):
+        window.update_price(next(payloads))
+        window.render(target)
+    try:
+        return measure(step, iterations)
+    finally:
+        window.close()
+        window.deleteLater()
+
+
+@benchmark("suite")
+def bench_suite(args):
+    """Frame-time percentiles, CPU and allocations per tick across the widget hot paths."""
+    n = args.frames
+    results = {}
+    for font_size in (26, 88, 200):
+        results[f"RollingDigit.paintEvent/font={font_size}"] = suite_digit_paint(font_size, n)
+    for number_cls in (main.RollingNumber, main.CompositeRollingNumber):
+        for digits in (4, 6, 8):
+            results[f"{number_cls.__name__}.setValue/digits={digits}"] = suite_number_set(number_cls, digits, n)
+    for capacity in (100, 1000, 10000):
+        for width in (1280, 3840):
+            results[f"TrendChart.addData+paintEvent/points={capacity}/width={width}"] = \
+                suite_chart(capacity, width, max(20, n // 10))
+    for width, height in ((152, 112), (1920, 1080), (3840, 2160)):
+        results[f"ScreenSaverWindow.update_price+paint/{width}x{height}"] = \
+            suite_window(width, height, max(20, n // 10))
+    return results
+
+
+@benchmark("mirror")
+def bench_mirror(args):
+    """Per-tick paint cost and object count: independent windows vs render-once mirroring."""
+    from PySide6.QtCore import QObject
+
+    payloads = synthetic_payloads()
+    size = (1920, 1080)
+    results = {}
+    for mode in ("independent", "mirror"):
+        scenes = [main.ScreenSaverWindow(main.PriceBus())
+                  for _ in range(args.screens if mode == "independent" else 1)]
+        for win in scenes:
+            win.showNormal()
+            win.resize(*size)
+        if mode == "independent":
+            windows = scenes
+        else:
+            # The scene goes off screen; every screen, the primary's included, blits its frame
+            windows = [scenes[0].render_offscreen()] + [main.MirrorWindow(scenes[0]) for _ in range(args.screens - 1)]
+            for win in windows:
+                win.showNormal()
+                win.resize(*size)
+        QApplication.processEvents()
+        targets = [QPixmap(win.size()) for win in windows]
+
+        def step(i):
+            payload = next(payloads)
+            for win in scenes:
+                win.update_price(payload)
+            if mode == "mirror":
+                scenes[0]._render_mirror()
+            for win, target in zip(windows, targets):
+                win.render(target)
+        result = measure(step, max(20, args.frames // 10))
+        result["qobjects"] = sum(len(win.findChildren(QObject)) + 1 for win in set(scenes + windows))
+        results[mode] = result
+        for win in scenes + windows:
+            win.close()
+            win.deleteLater()
+        QApplication.processEvents()
+    results["screens"] = args.screens
+    return results
+
+
+class EventCounter(main.QObject):
+    """Counts selected event types delivered to the widgets it is installed on."""
+    def __init__(self, types):
+        super().__init__()
+        self.types = types
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.types:
+            self.count += 1
+        return False
+
+
+@benchmark("drift")
+def bench_drift(args):
+    """Cost of one anti-burn-in drift step vs a full scene repaint, and the relayouts and repaints it causes."""
+    window = main.ScreenSaverWindow(main.PriceBus())
+    window.showNormal()
+    window.resize(1920, 1080)
+    payloads = synthetic_payloads()
+    window.update_price(next(payloads))
+    run_event_loop(1500)  # Let the roll-in animation settle
+
+    counter = EventCounter((QEvent.Type.Resize, QEvent.Type.LayoutRequest))
+    paints = EventCounter((QEvent.Type.Paint,))
+    for widget in [window.scene] + window.scene.findChildren(main.QWidget):
+        widget.installEventFilter(counter)
+        widget.installEventFilter(paints)
+    drift = window.drift
+    origin = window.scene.pos()
+
+    def drift_step(i):
+        # One-pixel moves, as the drift makes them
+        window.scene.move(origin + main.QPoint(i % 2, 0))
+        QApplication.processEvents()
+
+    def full_repaint(i):
+        window.scene.update()
+        QApplication.processEvents()
+
+    def idle_frame(i):
+        QApplication.processEvents()
+
+    try:
+        results = {
+            "drift_step": measure(drift_step, args.frames),
+            "relayout_events_during_drift": counter.count,
+            "scene_paints_per_drift_step": paints.count / args.frames,
+            "full_scene_repaint": measure(full_repaint, args.frames),
+            "idle_frame": measure(idle_frame, args.frames),
+            "drift_amplitude_px": drift.amplitude,
+        }
+    finally:
+        window.close()
+    return results
+
+
+def stub_server():
+    """Local keep-alive HTTP/1.1 server answering like the price API, with ETag/304 support."""
+    body = json.dumps({"success": True, "resultData": {"datas": {
+        "price": "560.00", "upAndDownAmt": "+1.20", "upAndDownRate": "+0.21%"}}}).encode()
+    etag = '"v1"'
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@benchmark("fetch")
+def bench_fetch(args):
+    """Per-poll latency, CPU and connections: bare requests.get vs the keep-alive PriceFetcher."""
+    import requests
+
+    server = stub_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    polls = max(args.ticks, 20)
+    try:
+        # What the worker did before: a fresh connection and a full body every poll
+        wall, cpu = [], 0.0
+        for _ in range(polls):
+            cpu_start = time.thread_time()
+            start = time.perf_counter()
+            requests.get(url, timeout=10).json()["resultData"]["datas"]
+            wall.append((time.perf_counter() - start) * 1000)
+            cpu += time.thread_time() - cpu_start
+        bare = summarize(wall)
+        bare.update({"avg_cpu_ms": cpu * 1000 / polls, "connections": polls})
+
+        fetcher = main.PriceFetcher(url)
+        results = [fetcher.fetch() for _ in range(polls)]
+        fetcher.close()
+        pooled = summarize([r.total_ms for r in results[1:]])  # Steady state: skip the first connect
+        pooled.update(fetcher.summary())
+        pooled["not_modified"] = sum(r.not_modified for r in results)
+
+        # The same numbers as the running app sees them, through the worker's fetch_timing
+        timings = []
+        worker = main.GoldPriceWorker(url, scheduler=main.PollScheduler(0.01))
+        worker.fetch_timing.connect(timings.append)
+        worker.start()
+        deadline = time.perf_counter() + 10
+        while len(timings) < 20 and time.perf_counter() < deadline:
+            run_event_loop(20)
+        worker.stop()
+        worker.wait()
+        worker_polls = summarize([r.total_ms for r in timings[1:]]) if len(timings) > 1 else None
+    finally:
+        server.shutdown()
+    return {
+        "requests_get": bare,
+        "price_fetcher": pooled,
+        "worker_fetch_timing": worker_polls,
+        "median_speedup": bare["median_ms"] / max(pooled["median_ms"], 1e-9),
+    }
+
+
+def slow_server(delay):
+    """Local HTTP server that holds every request for `delay` seconds (or until released)."""
+    requested = threading.Event()
+    release = threading.Event()
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested.set()
+            release.wait(delay)
+            body = b'{"success": true, "resultData": {"datas": {"price": "560.00"}}}'
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                pass  # The client aborted
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, requested, release
+
+
+@benchmark("shutdown")
+def bench_shutdown(args):
+    """Dismiss-to-exit latency while a fetch against a slow server is in flight."""
+    server, requested, release = slow_server(10.0)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    watcher = main.InputWatcher.instance()
+    key = QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_Space, Qt.KeyboardModifier.NoModifier)
+
+    def dismiss(abort=True):
+        """(input-to-exit ms, whether the exit had to be forced)."""
+        requested.clear()
+        bus = main.PriceBus(url=url)
+        window = main.ScreenSaverWindow(bus)
+        window.showNormal()
+        bus.start()
+        if not requested.wait(5.0):
+            raise RuntimeError("worker never reached the slow server")
+        forced = []
+        real_exit, real_abort = main.os._exit, main.PriceFetcher.abort
+        main.os._exit = lambda code: forced.append(code)
+        if not abort:
+            # Old behaviour: only the flag is set, the request runs to its timeout
+            main.PriceFetcher.abort = lambda self: None
+        try:
+            watcher.input_at = None  # Re-arm the process-wide trigger
+            QApplication.sendEvent(window.windowHandle(), key)
+            latency = watcher.exit_latency_ms()
+        finally:
+            main.os._exit, main.PriceFetcher.abort = real_exit, real_abort
+        if bus.worker.isRunning():
+            release.set()
+            bus.worker.wait()
+            release.clear()
+        return latency, bool(forced)
+
+    try:
+        samples, forced_exits = [], 0
+        for _ in range(args.repeat):
+            latency, forced = dismiss()
+            samples.append(latency)
+            forced_exits += forced
+        legacy_ms, legacy_forced = dismiss(abort=False)
+    finally:
+        release.set()
+        server.shutdown()
+    return {
+        "input_to_exit": summarize(samples),
+        "forced_exits": f"{forced_exits}/{args.repeat}",
+        "without_abort_ms": legacy_ms,
+        "without_abort_forced": legacy_forced,
+    }
+
+
+def write_capture(path, ticks, interval=5.0):
+    """Synthetic capture in the RecordingSource format, one tick every `interval` seconds."""
+    start = time.time()
+    with open(path, "w", encoding="utf-8") as f:
+        for i, payload in zip(range(ticks), synthetic_payloads()):
+            f.write(json.dumps({"t": start + i * interval, "payload": payload}) + "\n")
+
+
+@benchmark("soak")
+def bench_soak(args):
+    """Replay --ticks ticks at maximum speed into a full-size window: throughput and memory growth."""
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    write_capture(path, args.ticks)
+
+    def replay(checkpoint=None):
+        bus = main.PriceBus(source=main.ReplaySource(path, speed=0))
+        window = main.ScreenSaverWindow(bus)
+        window.showNormal()
+        window.resize(1920, 1080)
+        received = 0
+
+        def on_tick(data):
+            nonlocal received
+            received += 1
+            if checkpoint is not None and received == max(1, args.ticks // 10):
+                checkpoint()
+        bus.tick.connect(on_tick)
+        loop = QEventLoop()
+        start = time.perf_counter()
+        bus.start()
+        bus.worker.finished.connect(loop.quit)
+        if bus.worker.isFinished():
+            QApplication.processEvents()  # Done before we connected: just drain the queued ticks
+        else:
+            loop.exec()
+        elapsed = time.perf_counter() - start
+        bus.stop()
+        window.close()
+        return received, elapsed
+
+    try:
+        received, elapsed = replay()
+        # Second pass under tracemalloc: growth between 10% and the end of the replay is a leak
+        marks = []
+        tracemalloc.start()
+        replay(lambda: marks.append(tracemalloc.get_traced_memory()[0]))
+        end = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        os.remove(path)
+    growth = end - marks[0] if marks else None
+    return {
+        "ticks": received,
+        "ticks_per_second": received / max(elapsed, 1e-9),
+        "ms_per_tick": elapsed * 1000 / max(received, 1),
+        "retained_growth_bytes": growth,
+        "retained_bytes_per_tick": growth / max(args.ticks - args.ticks // 10, 1) if marks else None,
+    }
+
+
+def environment():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        revision = ""
+    return {
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "pyside6": PySide6.__version__,
+        "platform": platform.platform(),
+        "qpa": os.environ.get("QT_QPA_PLATFORM"),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(result, baseline):
+    """Print median ratios (current / baseline) for every entry present in both runs."""
+    for key, current in result.items():
+        before = baseline.get(key)
+        if isinstance(current, dict) and isinstance(before, dict) and "median_ms" in current and "median_ms" in before:
+            ratio = current["median_ms"] / max(before["median_ms"], 1e-9)
+            flag = "  REGRESSION" if ratio > 1.1 else ""
+            print(f"{key}: {before['median_ms']:.3f} -> {current['median_ms']:.3f} ms (x{ratio:.2f}){flag}")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--font-size", type=int, default=88)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--screens", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the result as JSON to this file")
+    parser.add_argument("--compare", help="JSON file from an earlier run to compare medians against")
+    args = parser.parse_args(argv)
+
+    QApplication.instance() or QApplication(sys.argv[:1])
+    result = BENCHMARKS[args.name](args)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": args.name, "environment": environment(), "results": result}, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(result, json.load(f)["results"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
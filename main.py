@@ -1,52 +1,349 @@
+import time
+_T_START = time.perf_counter()  # Reference point for the startup probe
+
 import sys
 import os
-import requests
-import time
-import ctypes
-from ctypes import wintypes
-from typing import Optional, Dict, Any
+import abc
+import math
+import operator
+import random
+import mmap
+import struct
+import threading
+from array import array
+from collections import deque
+from itertools import repeat
+from typing import Optional, Dict, Any, NamedTuple, Callable
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, 
     QWidget, QFrame, QGraphicsDropShadowEffect, QGraphicsOpacityEffect,
-    QMessageBox
+    QDialog, QDialogButtonBox, QComboBox
 )
 from PySide6.QtCore import (
-    Qt, QTimer, QThread, Signal, QPropertyAnimation, 
+    Qt, QObject, QTimer, QThread, Signal,
     QEasingCurve, QPoint, QPointF, QSize, QParallelAnimationGroup, QSequentialAnimationGroup,
-    Property, QRect
+    QRect, QRectF, QSettings, QEvent, QSizeF
 )
 from PySide6.QtGui import (
-    QFont, QColor, QMouseEvent, QKeyEvent, QScreen, 
-    QPainter, QPen, QPainterPath, QLinearGradient, QGradient, QCursor
+    QFont, QColor, QScreen,
+    QPainter, QPen, QPainterPath, QLinearGradient, QGradient, QCursor, QPixmap, QPolygonF, QStaticText, QTransform
 )
+from shiboken6 import isValid
+# The HTTP stack (requests/urllib3) and the preview-only ctypes plumbing are imported
+# where they are used, so a cold /s launch reaches its first frame without them.
+
+_IMPORTS_DONE = time.perf_counter()
+
+# API URL for Gold Price (GOLD_SAVER_API_URL overrides it, e.g. to point at a local stub server)
+DEFAULT_API_URL = "https://api.jdjygold.com/gw2/generic/jrm/h5/m/stdLatestPrice?productSku=1961543816"
+API_URL = os.environ.get("GOLD_SAVER_API_URL", DEFAULT_API_URL)
+
+# Number of ticks shown by the live trend chart
+CHART_CAPACITY = 100
+
+def setting(key: str, default: Any) -> Any:
+    """Read a user setting; GOLD_SAVER_<KEY> in the environment takes precedence."""
+    env = os.environ.get("GOLD_SAVER_" + key.upper().replace("/", "_"))
+    if env is not None:
+        return env
+    return QSettings("GoldPriceSaver", "GoldPriceSaver").value(key, default)
 
-# API URL for Gold Price
-API_URL = "https://api.jdjygold.com/gw2/generic/jrm/h5/m/stdLatestPrice?productSku=1961543816"
+def save_setting(key: str, value: Any) -> None:
+    QSettings("GoldPriceSaver", "GoldPriceSaver").setValue(key, value)
 
 # Enable High DPI scaling
 QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
 
+class Histogram:
+    """Latency histogram with power-of-two millisecond buckets (<1, <2, <4, ... ms)."""
+    def __init__(self, buckets: int = 16) -> None:
+        self.counts = [0] * buckets
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        self.counts[min(len(self.counts) - 1, int(ms).bit_length())] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "buckets": {f"<{1 << i}ms": n for i, n in enumerate(self.counts) if n},
+        }
+
+class Metrics:
+    """Opt-in hot-path instrumentation (GOLD_SAVER_METRICS_ENABLED=1 or the metrics/enabled setting).
+
+    Every probe is guarded by a single `METRICS.enabled` check, so the disabled
+    cost is one attribute lookup per paint, frame or poll.
+    """
+    def __init__(self) -> None:
+        self.enabled = False
+        self.path: Optional[str] = None
+        self.fetch_latency = Histogram()
+        self.fetch_errors: Dict[str, int] = {}
+        self.paint: Dict[str, Histogram] = {}
+        self.queue_delay = Histogram()
+        self.frames = 0
+        self.late_frames = 0  # Ticks that arrived more than 1.5 intervals apart
+        self.dropped_frames = 0  # Whole intervals skipped by late ticks
+        self.dismiss_ms: Optional[float] = None
+        self._active: Dict[int, int] = {}  # Active tweens per FrameClock
+        self._emitted: deque = deque()  # Worker-side emit timestamps awaiting the GUI thread
+        self._timer: Optional[QTimer] = None
+
+    def enable(self, path: Optional[str] = None, interval_ms: int = 10000) -> None:
+        """Start collecting; with a path, the snapshot is also written there periodically."""
+        self.enabled = True
+        self.path = path
+        if path and self._timer is None:
+            self._timer = QTimer()
+            self._timer.timeout.connect(self.write)
+            self._timer.start(interval_ms)
+
+    @property
+    def active_animations(self) -> int:
+        return sum(self._active.values())
+
+    def record_paint(self, widget_class: str, ms: float) -> None:
+        hist = self.paint.get(widget_class)
+        if hist is None:
+            hist = self.paint[widget_class] = Histogram()
+        hist.add(ms)
+
+    def record_fetch(self, result: "FetchResult") -> None:
+        self.fetch_latency.add(result.total_ms)
+        if result.error:
+            kind = f"HTTP {result.status}" if result.status else "network"
+            self.fetch_errors[kind] = self.fetch_errors.get(kind, 0) + 1
+
+    def record_active(self, clock: QObject, active: int) -> None:
+        """Active tween count of one clock, without counting a frame."""
+        self._active[id(clock)] = active
+
+    def record_frame(self, clock: QObject, active: int, interval_ms: float, expected_ms: float) -> None:
+        self.record_active(clock, active)
+        self.frames += 1
+        if interval_ms > expected_ms * 1.5:
+            self.late_frames += 1
+            self.dropped_frames += int(interval_ms / expected_ms) - 1
+
+    def mark_emit(self) -> None:
+        self._emitted.append(time.perf_counter())
+
+    def mark_receive(self) -> None:
+        if self._emitted:
+            self.queue_delay.add((time.perf_counter() - self._emitted.popleft()) * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "timestamp": time.time(),
+            "fetch_latency": self.fetch_latency.to_dict(),
+            "fetch_errors": dict(self.fetch_errors),
+            "paint": {name: hist.to_dict() for name, hist in self.paint.items()},
+            "active_animations": self.active_animations,
+            "frames": self.frames,
+            "late_frames": self.late_frames,
+            "dropped_frames": self.dropped_frames,
+            "queue_delay": self.queue_delay.to_dict(),
+            "dismiss_ms": self.dismiss_ms,
+        }
+
+    def summary_lines(self) -> list:
+        fetch, queue = self.fetch_latency, self.queue_delay
+        lines = [
+            f"fetch {fetch.count}x avg {fetch.total_ms / max(fetch.count, 1):.1f}ms max {fetch.max_ms:.1f}ms"
+            f" err {sum(self.fetch_errors.values())}",
+            f"queue avg {queue.total_ms / max(queue.count, 1):.2f}ms max {queue.max_ms:.2f}ms",
+            f"anim {self.active_animations}  frames {self.frames} late {self.late_frames}"
+            f" dropped {self.dropped_frames}",
+        ]
+        for name, hist in sorted(self.paint.items()):
+            lines.append(f"paint {name} avg {hist.total_ms / max(hist.count, 1):.2f}ms max {hist.max_ms:.2f}ms")
+        return lines
+
+    def write(self) -> None:
+        if not self.path:
+            return
+        import json
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=1)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+METRICS = Metrics()
+
+def timed_paint(paint: Callable) -> Callable:
+    """Record a paintEvent's duration under its widget class when metrics are enabled."""
+    def wrapper(self, event):
+        if not METRICS.enabled:
+            return paint(self, event)
+        start = time.perf_counter()
+        paint(self, event)
+        METRICS.record_paint(type(self).__name__, (time.perf_counter() - start) * 1000)
+    wrapper.__name__, wrapper.__doc__ = paint.__name__, paint.__doc__
+    return wrapper
+
+class Tween:
+    """A value eased from start to end over duration_ms, advanced by a FrameClock.
+
+    apply() only stores the new value; the clock repaints the widget afterwards.
+    """
+    def __init__(self, clock: "FrameClock", widget: QWidget, duration_ms: int,
+                 easing: QEasingCurve.Type, apply: Callable[[float], None]) -> None:
+        self.clock = clock
+        self.widget = widget
+        self.duration_ms = duration_ms
+        self.curve = QEasingCurve(easing)
+        self.apply = apply
+        self.start_value = 0.0
+        self.end_value = 0.0
+        self._started = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self in self.clock._tweens
+
+    def start(self, start_value: float, end_value: float) -> None:
+        self.start_value, self.end_value = start_value, end_value
+        self._started = self.clock.now()
+        self.clock._add(self)
+
+    def stop(self) -> None:
+        self.clock._remove(self)
+
+    def _advance(self, now: float) -> bool:
+        """Apply the value for `now`; True once the tween has finished."""
+        progress = min(1.0, (now - self._started) / self.duration_ms) if self.duration_ms > 0 else 1.0
+        eased = self.curve.valueForProgress(progress)
+        self.apply(self.start_value + (self.end_value - self.start_value) * eased)
+        return progress >= 1.0
+
+class FrameClock(QObject):
+    """One frame timer per window driving every active Tween.
+
+    Each tick advances all tweens first and then marks every touched widget dirty in
+    one go, so Qt flushes them as a single repaint. The timer only runs while at
+    least one tween is active; between price changes the window is fully idle.
+    """
+    frame = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None, interval_ms: int = 16) -> None:
+        super().__init__(parent)
+        self._tweens: list = []
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+        self._last_tick = 0.0
+        self.last_interval_ms = 0.0  # Time between the two most recent ticks
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter() * 1000
+
+    @property
+    def active(self) -> int:
+        return len(self._tweens)
+
+    def setInterval(self, interval_ms: int) -> None:
+        self._timer.setInterval(interval_ms)
+
+    def _add(self, tween: Tween) -> None:
+        if tween not in self._tweens:
+            self._tweens.append(tween)
+        if not self._timer.isActive():
+            self._last_tick = self.now()
+            self._timer.start()
+
+    def _remove(self, tween: Tween) -> None:
+        if tween in self._tweens:
+            self._tweens.remove(tween)
+        if not self._tweens:
+            self._timer.stop()
+            if METRICS.enabled:
+                METRICS.record_active(self, 0)
+
+    def _tick(self) -> None:
+        now = self.now()
+        dirty = []
+        for tween in list(self._tweens):
+            if not isValid(tween.widget):
+                # Its widget was deleted mid-animation (e.g. a rebuilt RollingNumber)
+                self._tweens.remove(tween)
+                continue
+            if tween._advance(now):
+                self._tweens.remove(tween)
+            if tween.widget not in dirty:
+                dirty.append(tween.widget)
+        for widget in dirty:
+            widget.update()
+        if not self._tweens:
+            self._timer.stop()
+        self.last_interval_ms = now - self._last_tick
+        if METRICS.enabled:
+            METRICS.record_frame(self, len(self._tweens), self.last_interval_ms, self._timer.interval())
+        self._last_tick = now
+        self.frame.emit()
+
+class GlyphAtlas:
+    """Digits 0-9 rasterized once into a vertical strip of cells, shared by all RollingDigits.
+
+    Strips are keyed by font size, cell size and device pixel ratio; rolling a digit
+    then only blits slices of the strip instead of shaping text on every frame.
+    """
+    _strips: Dict[tuple, QPixmap] = {}
+
+    @classmethod
+    def strip(cls, font_size: int, width: int, height: int, dpr: float) -> QPixmap:
+        key = (font_size, width, height, round(dpr, 3))
+        pix = cls._strips.get(key)
+        if pix is None:
+            pix = QPixmap(round(width * dpr), round(height * dpr) * 10)
+            pix.setDevicePixelRatio(dpr)
+            pix.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pix)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setFont(QFont("'Segoe UI Variable Display', 'Inter'", font_size, QFont.Weight.Bold))
+            painter.setPen(QColor("#FFFFFF"))
+            cell_h = round(height * dpr) / dpr
+            for d in range(10):
+                painter.drawText(QRectF(0, d * cell_h, width, cell_h), Qt.AlignmentFlag.AlignCenter, str(d))
+            painter.end()
+            cls._strips[key] = pix
+        return pix
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._strips.clear()
+
 class RollingDigit(QWidget):
     """A single digit that rolls up/down like an odometer."""
-    def __init__(self, font_size: int = 90, parent=None):
+    use_glyph_atlas = True  # False falls back to per-frame drawText (kept for benchmarking)
+
+    def __init__(self, font_size: int = 90, clock: Optional[FrameClock] = None, parent=None):
         super().__init__(parent)
         self._value = 0.0 # Odometer-like position
         self._target_value = 0.0
         self.font_size = font_size
         self.setFixedWidth(int(font_size * 0.9)) 
         self.setFixedHeight(int(font_size * 1.8))
-        self.anim = QPropertyAnimation(self, b"value_prop")
-        self.anim.setDuration(1200) # Slower for more smoothness
-        self.anim.setEasingCurve(QEasingCurve.Type.OutExpo)
-
-    @Property(float)
-    def value_prop(self): return self._value
-    @value_prop.setter
-    def value_prop(self, val):
+        # Slower for more smoothness
+        self.anim = Tween(clock or FrameClock(self), self, 1200, QEasingCurve.Type.OutExpo, self._set_value)
+
+    def _set_value(self, val: float) -> None:
         self._value = val
-        self.update()
 
-    def setDigit(self, digit: str):
+    def setDigit(self, digit: str, animate: bool = True):
         if not digit.isdigit(): return
         target = float(digit)
         
@@ -61,13 +358,19 @@ class RollingDigit(QWidget):
         
         if abs(target_abs - self._value) < 0.01: return
 
-        self.anim.stop()
-        self.anim.setStartValue(self._value)
-        self.anim.setEndValue(target_abs)
-        self.anim.start()
+        if not animate:
+            self.anim.stop()
+            self._value = target_abs
+            self.update()
+            return
+        self.anim.start(self._value, target_abs)
 
+    @timed_paint
     def paintEvent(self, event):
         painter = QPainter(self)
+        if self.use_glyph_atlas:
+            self._paint_from_atlas(painter)
+            return
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setFont(QFont("'Segoe UI Variable Display', 'Inter'", self.font_size, QFont.Weight.Bold))
         painter.setPen(QColor("#FFFFFF"))
@@ -81,18 +384,34 @@ class RollingDigit(QWidget):
             rect = QRect(0, int(y_pos - h/2), self.width(), h)
             painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, str(digit))
 
+    def _paint_from_atlas(self, painter: QPainter) -> None:
+        w, h = self.width(), self.height()
+        dpr = self.devicePixelRatioF()
+        strip = GlyphAtlas.strip(self.font_size, w, h, dpr)
+        src_w, src_h = strip.width(), round(h * dpr)
+        # At most two cells are visible at once; snap them to device pixels for a 1:1 blit
+        for i in range(-1, 2):
+            val_to_draw = math.floor(self._value + i + 0.5)
+            top = round((val_to_draw - self._value) * h * dpr) / dpr
+            if top <= -h or top >= h:
+                continue
+            painter.drawPixmap(QRectF(0, top, w, h), strip,
+                               QRectF(0, (val_to_draw % 10) * src_h, src_w, src_h))
+
 class RollingNumber(QWidget):
     """A widget composed of multiple rolling digits."""
-    def __init__(self, font_size: int = 80, parent=None):
+    def __init__(self, font_size: int = 80, clock: Optional[FrameClock] = None, parent=None):
         super().__init__(parent)
         self.font_size = font_size
+        self.clock = clock or FrameClock(self)
+        self.roll_ms = 1200
         self.layout = QHBoxLayout(self)
         self.layout.setSpacing(2) # Add small spacing between digits
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.digits = []
         self._value = ""
 
-    def setValue(self, value: str):
+    def setValue(self, value: str, animate: bool = True):
         if value == self._value: return
         
         # Sync digits
@@ -100,7 +419,10 @@ class RollingNumber(QWidget):
             # Clear and rebuild to avoid layout issues
             while self.layout.count():
                 item = self.layout.takeAt(0)
-                if item.widget(): item.widget().deleteLater()
+                widget = item.widget()
+                if isinstance(widget, RollingDigit):
+                    widget.anim.stop()  # Its tween lives in the shared clock
+                if widget: widget.deleteLater()
             self.digits = []
             
             for char in value:
@@ -112,106 +434,502 @@ class RollingNumber(QWidget):
                     self.layout.addWidget(lbl)
                     self.digits.append(lbl)
                 else:
-                    d = RollingDigit(font_size=int(self.font_size * 1.1))
+                    d = RollingDigit(font_size=int(self.font_size * 1.1), clock=self.clock)
+                    d.anim.duration_ms = self.roll_ms
                     self.layout.addWidget(d)
                     self.digits.append(d)
         
         for i, char in enumerate(value):
             if isinstance(self.digits[i], RollingDigit) and char.isdigit():
-                self.digits[i].setDigit(char)
+                self.digits[i].setDigit(char, animate)
             elif isinstance(self.digits[i], QLabel):
                 self.digits[i].setText(char)
         self._value = value
 
+    def setRollDuration(self, ms: int) -> None:
+        self.roll_ms = ms
+        for d in self.digits:
+            if isinstance(d, RollingDigit):
+                d.anim.duration_ms = ms
+
+class CompositeRollingNumber(QWidget):
+    """Draws the whole price (currency sign, digits, decimal point) in one paintEvent.
+
+    Per-column roll state lives in flat arrays and a single Tween drives every column,
+    so a new price costs no widget creation or layout pass. A change of length
+    (999.99 -> 1000.00) only re-aligns the arrays on the decimal side.
+    Digit columns use the same metrics and glyph atlas as RollingDigit.
+    """
+    spacing = 2
+
+    def __init__(self, font_size: int = 80, clock: Optional[FrameClock] = None, parent=None):
+        super().__init__(parent)
+        self.font_size = font_size
+        self.digit_font_size = int(font_size * 1.1)
+        self.cell_w = int(self.digit_font_size * 0.9)
+        self.cell_h = int(self.digit_font_size * 1.8)
+        self.sep_w = int(font_size * 0.55)
+        font = QFont()
+        font.setPixelSize(font_size)
+        font.setBold(True)
+        self._font = font
+        self._static: Dict[str, QStaticText] = {}  # Pre-laid-out non-digit glyphs
+        self._chars = ""
+        # Roll positions per column: current, tween start and tween end
+        self._pos = array("d")
+        self._from = array("d")
+        self._to = array("d")
+        self._value = ""
+        self.anim = Tween(clock or FrameClock(self), self, 1200, QEasingCurve.Type.OutExpo, self._set_progress)
+        self.antialias = True
+        self.setFixedHeight(self.cell_h)
+
+    def setRollDuration(self, ms: int) -> None:
+        self.anim.duration_ms = ms
+
+    def _set_progress(self, p: float) -> None:
+        self._pos = array("d", map(operator.add, self._from,
+                                   map(operator.mul, map(operator.sub, self._to, self._from), repeat(p))))
+
+    def setValue(self, value: str, animate: bool = True):
+        if value == self._value: return
+
+        if len(value) != len(self._chars):
+            # Keep columns aligned from the right so the decimals stay in place
+            keep = min(len(value), len(self._chars))
+            pad = array("d", bytes(8 * (len(value) - keep)))
+            self._pos = pad + self._pos[len(self._pos) - keep:]
+            width = sum(self.cell_w if c.isdigit() else self.sep_w for c in value)
+            self.setFixedWidth(width + self.spacing * max(0, len(value) - 1))
+        self._chars = value
+
+        # Shortest rolling path per digit column, as in RollingDigit.setDigit
+        target = array("d", self._pos)
+        for i, char in enumerate(value):
+            if not char.isdigit():
+                continue
+            current = self._pos[i]
+            target_abs = int(current) // 10 * 10 + int(char)
+            while target_abs - current > 5: target_abs -= 10
+            while target_abs - current < -5: target_abs += 10
+            target[i] = target_abs
+        self._value = value
+
+        if animate:
+            self._from, self._to = array("d", self._pos), target
+            self.anim.start(0.0, 1.0)
+        else:
+            self.anim.stop()
+            self._pos = self._from = self._to = target
+        self.update()
+
+    def _static_text(self, char: str) -> QStaticText:
+        text = self._static.get(char)
+        if text is None:
+            text = QStaticText(char)
+            text.prepare(QTransform(), self._font)
+            self._static[char] = text
+        return text
+
+    @timed_paint
+    def paintEvent(self, event):
+        if not self._chars:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, self.antialias)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing, self.antialias)
+        painter.setFont(self._font)
+        painter.setPen(QColor("#FFFFFF"))
+        dpr = self.devicePixelRatioF()
+        strip = GlyphAtlas.strip(self.digit_font_size, self.cell_w, self.cell_h, dpr)
+        src_w, src_h = strip.width(), round(self.cell_h * dpr)
+        h = self.cell_h
+        y0 = (self.height() - h) / 2
+
+        x = 0
+        for char, pos in zip(self._chars, self._pos):
+            if char.isdigit():
+                # At most two cells are visible; snapped to device pixels as in RollingDigit
+                for i in range(-1, 2):
+                    val_to_draw = math.floor(pos + i + 0.5)
+                    top = round((val_to_draw - pos) * h * dpr) / dpr
+                    if top <= -h or top >= h:
+                        continue
+                    painter.drawPixmap(QRectF(x, y0 + top, self.cell_w, h), strip,
+                                       QRectF(0, (val_to_draw % 10) * src_h, src_w, src_h))
+                x += self.cell_w + self.spacing
+            else:
+                text = self._static_text(char)
+                size = text.size()
+                painter.drawStaticText(QPointF(x + (self.sep_w - size.width()) / 2,
+                                               y0 + (h - size.height()) / 2), text)
+                x += self.sep_w + self.spacing
+
+class PriceRing:
+    """Fixed-capacity ring buffer of prices backed by a flat array('d')."""
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._buf = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, price: float) -> None:
+        self._buf[(self._start + self._count) % self.capacity] = price
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def first(self) -> float:
+        return self._buf[self._start]
+
+    def last(self) -> float:
+        return self._buf[(self._start + self._count - 1) % self.capacity]
+
+    def values(self) -> array:
+        """Oldest-to-newest copy made of at most two slice copies."""
+        end = self._start + self._count
+        if end <= self.capacity:
+            return self._buf[self._start:end]
+        return self._buf[self._start:] + self._buf[:end - self.capacity]
+
+def session_day(timestamp: float) -> int:
+    """Trading-day number; a session starts with the 20:00 Beijing night session."""
+    return int((timestamp + 12 * 3600) // 86400)
+
+def column_extremes(series, columns: int) -> array:
+    """Lows then highs of `columns` equal index buckets: 2 * columns values.
+
+    TrendChart fills the band between them instead of stroking every point, so a
+    dense history keeps its spikes while the paint cost only depends on the width.
+    """
+    n = len(series)
+    lows, highs = array("d"), array("d")
+    for c in range(columns):
+        chunk = series[c * n // columns:(c + 1) * n // columns]
+        lows.append(min(chunk))
+        highs.append(max(chunk))
+    return lows + highs
+
+class StreamingIndicators:
+    """Statistics over the last `window` ticks, each updated in O(1) per tick.
+
+    - rolling high / low from monotonic deques
+    - simple moving average and standard deviation from running sums
+    - exponential moving average
+    - time-weighted average price for the session (the feed carries no volume,
+      so time at a price stands in for traded size)
+    - session open: the first price of the current trading day
+    """
+    def __init__(self, window: int = CHART_CAPACITY, ema_span: int = 20) -> None:
+        self.window = window
+        self._alpha = 2.0 / (ema_span + 1)
+        self._prices: deque = deque()
+        self._highs: deque = deque()  # (tick index, price), prices decreasing
+        self._lows: deque = deque()  # (tick index, price), prices increasing
+        self._count = 0
+        self._shift = 0.0  # Sums are kept around this to avoid cancellation
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self.ema: Optional[float] = None
+        self.session_open: Optional[float] = None
+        self._session: Optional[int] = None
+        self._twap_sum = 0.0
+        self._twap_time = 0.0
+        self._last: Optional[tuple] = None  # (timestamp, price) of the previous tick
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def push(self, price: float, timestamp: Optional[float] = None) -> None:
+        timestamp = time.time() if timestamp is None else timestamp
+        i = self._count
+        self._count += 1
+        if i == 0:
+            self._shift = price
+
+        # Rolling window sums
+        self._prices.append(price)
+        d = price - self._shift
+        self._sum += d
+        self._sumsq += d * d
+        if len(self._prices) > self.window:
+            d = self._prices.popleft() - self._shift
+            self._sum -= d
+            self._sumsq -= d * d
+
+        # Monotonic deques: the front is always the extreme of the window
+        while self._highs and self._highs[-1][1] <= price:
+            self._highs.pop()
+        self._highs.append((i, price))
+        if self._highs[0][0] <= i - self.window:
+            self._highs.popleft()
+        while self._lows and self._lows[-1][1] >= price:
+            self._lows.pop()
+        self._lows.append((i, price))
+        if self._lows[0][0] <= i - self.window:
+            self._lows.popleft()
+
+        self.ema = price if self.ema is None else self.ema + self._alpha * (price - self.ema)
+
+        # Session open and time-weighted average, reset at each new trading day
+        day = session_day(timestamp)
+        if day != self._session:
+            self._session = day
+            self.session_open = price
+            self._twap_sum = self._twap_time = 0.0
+        elif self._last is not None:
+            held = max(0.0, timestamp - self._last[0])
+            self._twap_sum += self._last[1] * held
+            self._twap_time += held
+        self._last = (timestamp, price)
+
+    @property
+    def high(self) -> Optional[float]:
+        return self._highs[0][1] if self._highs else None
+
+    @property
+    def low(self) -> Optional[float]:
+        return self._lows[0][1] if self._lows else None
+
+    @property
+    def sma(self) -> Optional[float]:
+        return self._shift + self._sum / len(self._prices) if self._prices else None
+
+    @property
+    def stdev(self) -> float:
+        n = len(self._prices)
+        if n < 2:
+            return 0.0
+        mean = self._sum / n
+        return math.sqrt(max(0.0, self._sumsq / n - mean * mean))
+
+    @property
+    def twap(self) -> Optional[float]:
+        if self._twap_time > 0:
+            return self._twap_sum / self._twap_time
+        return self._last[1] if self._last else None
+
 class TrendChart(QWidget):
     """A smooth line chart for price history."""
-    def __init__(self, parent=None):
+    PEN_WIDTH = 4
+
+    def __init__(self, capacity: int = CHART_CAPACITY, clock: Optional[FrameClock] = None, parent=None):
         super().__init__(parent)
-        self.history = []
-        self._prev_series = []
-        self._target_series = []
+        self.history = PriceRing(capacity)
+        # Y range comes from the streaming high/low, never from rescanning the series
+        self.indicators = StreamingIndicators(capacity)
+        self._bounds = (0.0, 0.0)
+        self._prev_bounds = (0.0, 0.0)
+        self.levels: Dict[str, float] = {}  # Horizontal indicator lines, see setLevels()
+        # Animation runs from _prev_series to _prev_series + _delta_series
+        self._prev_series = array("d")
+        self._delta_series = array("d")
+        self._xs: list = []
+        self._xs_key: tuple = ()
+        # Rendered static frame, reused until _cache_key changes
+        self._data_version = 0
+        self._cache: Optional[QPixmap] = None
+        self._cache_key: tuple = ()
+        self.path_builds = 0  # Number of times the path/fill were rebuilt (for benchmarks)
         self._t = 1.0
-        self._series_anim = QPropertyAnimation(self, b"anim_t")
-        self._series_anim.setDuration(900)
-        self._series_anim.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self._series_tween = Tween(clock or FrameClock(self), self, 900, QEasingCurve.Type.OutCubic, self._set_t)
+        # Render quality, adjusted by the window's QualityGovernor
+        self.antialias = True
+        self.max_points = 0  # 0 = one column per four pixels
+        self._columns_key: tuple = ()
+        self._columns: tuple = ()  # Decimated (prev, delta, target), see _decimated()
         self.setMinimumHeight(200)
 
-    @Property(float)
-    def anim_t(self):
-        return self._t
-
-    @anim_t.setter
-    def anim_t(self, value: float):
+    def _set_t(self, value: float) -> None:
         self._t = value
+
+    def seed(self, prices) -> None:
+        """Fill the history without animating, e.g. from the on-disk tick log."""
+        for price in prices:
+            self.history.append(price)
+            self.indicators.push(price)
+        if prices:
+            self._bounds = self._prev_bounds = (self.indicators.low, self.indicators.high)
+        self._prev_series = self.history.values()
+        self._delta_series = array("d", bytes(8 * len(self._prev_series)))
+        self._series_tween.stop()
+        self._t = 1.0
+        self._data_version += 1
         self.update()
 
     def addData(self, price: float):
-        if not self.history:
-            self.history = [price]
-            self._prev_series = [price]
-            self._target_series = [price]
+        prev = self.history.values()
+        self.history.append(price)
+        self.indicators.push(price)
+        self._animate_from(prev, (self.indicators.low, self.indicators.high))
+
+    def setSeries(self, prices) -> None:
+        """Replace the whole series (long-range views) and tween to it."""
+        prev = self.history.values()
+        self.history = PriceRing(max(len(prices), 1))
+        for price in prices:
+            self.history.append(price)
+        # One pass over the decimated points per query, not per frame
+        self._animate_from(prev, (min(prices), max(prices)) if prices else (0.0, 0.0))
+
+    def setLevels(self, **levels: Optional[float]) -> None:
+        """Set horizontal indicator lines (e.g. open=..., ma=...); None hides a line."""
+        levels = {name: value for name, value in levels.items() if value is not None}
+        if levels != self.levels:
+            self.levels = levels
+            self.update()
+
+    def _animate_from(self, prev: array, bounds: tuple) -> None:
+        self._data_version += 1
+        self._prev_bounds = self._current_bounds() if prev else bounds
+        self._bounds = bounds
+        target = self.history.values()
+        if not prev or not target:
+            self._prev_series = target
+            self._delta_series = array("d", bytes(8 * len(target)))
+            self._series_tween.stop()
             self._t = 1.0
+            self._prev_bounds = bounds
             self.update()
             return
 
-        current_series = self._target_series if self._target_series else self.history
-        self._prev_series = list(current_series)
-
-        self.history.append(price)
-        if len(self.history) > 100: self.history.pop(0)
-        self._target_series = list(self.history)
-
-        if len(self._prev_series) < len(self._target_series):
-            pad = [self._prev_series[0]] * (len(self._target_series) - len(self._prev_series))
-            self._prev_series = pad + self._prev_series
-        elif len(self._prev_series) > len(self._target_series):
-            self._prev_series = self._prev_series[-len(self._target_series):]
+        # Align the previous frame with the new one: pad at the front while the
+        # buffer is filling, each slot then morphs to its new value in place
+        if len(prev) < len(target):
+            prev = array("d", [prev[0]]) * (len(target) - len(prev)) + prev
+        elif len(prev) > len(target):
+            prev = prev[len(prev) - len(target):]
+        self._prev_series = prev
+        self._delta_series = array("d", map(operator.sub, target, prev))
 
-        self._series_anim.stop()
         self._t = 0.0
-        self._series_anim.setStartValue(0.0)
-        self._series_anim.setEndValue(1.0)
-        self._series_anim.start()
+        self._series_tween.start(0.0, 1.0)
         self.update()
 
-    def paintEvent(self, event):
-        if len(self.history) < 2:
-            return
-
-        if self._target_series and self._prev_series and self._t < 1.0:
-            series = [a + (b - a) * self._t for a, b in zip(self._prev_series, self._target_series)]
-        else:
-            series = self.history
+    def _current_bounds(self) -> tuple:
+        # Min/max of an interpolated series never leave the interpolated bounds
+        t = self._t
+        (lo0, hi0), (lo1, hi1) = self._prev_bounds, self._bounds
+        return lo0 + (lo1 - lo0) * t, hi0 + (hi1 - hi0) * t
 
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        w, h = self.width(), self.height()
-        min_p, max_p = min(series), max(series)
+    def _y_mapping(self, h: int) -> tuple:
+        """(offset, scale) so that y = offset - price * scale."""
+        min_p, max_p = self._current_bounds()
         p_range = max_p - min_p if max_p != min_p else 1.0
         
         # Add padding
         min_p -= p_range * 0.1
         max_p += p_range * 0.1
-        p_range = max_p - min_p
+        scale = h / (max_p - min_p)
+        return h + min_p * scale, scale
 
-        path = QPainterPath()
+    def _x_coords(self, n: int, w: int) -> list:
+        if self._xs_key != (n, w):
+            step = w / (n - 1)
+            self._xs = [i * step for i in range(n)]
+            self._xs_key = (n, w)
+        return self._xs
+
+    def _decimated(self, columns: int) -> tuple:
+        """Per-column extremes of the tween's start, delta and end; rebuilt once per data change."""
+        key = (self._data_version, columns)
+        if self._columns_key != key:
+            target = self.history.values()
+            prev = self._prev_series if len(self._prev_series) == len(target) else target
+            prev_c, target_c = column_extremes(prev, columns), column_extremes(target, columns)
+            self._columns = (prev_c, array("d", map(operator.sub, target_c, prev_c)), target_c)
+            self._columns_key = key
+        return self._columns
+
+    def _series_points(self, w: int, h: int) -> tuple:
+        """Interpolate and map the series to widget coordinates in batched map() passes.
+
+        Returns (points, band). A history with more points than one per four pixels
+        (or than max_points / 2, which lower quality tiers set) is reduced to per-column
+        lows and highs first; points is then the closed outline of that band, thickened by
+        the pen, and band is True. Either way a frame costs O(width), not O(history).
+        """
+        columns = w // 4
+        if self.max_points:
+            columns = min(columns, self.max_points // 2)
+        columns = max(2, columns)
+        band = len(self.history) > columns
+        if band:
+            prev, delta, target = self._decimated(columns)
+        else:
+            prev, delta, target = self._prev_series, self._delta_series, self.history.values()
+        if self._t < 1.0:
+            series = list(map(operator.add, prev, map(operator.mul, delta, repeat(self._t))))
+        else:
+            series = target
+
+        offset, scale = self._y_mapping(h)
+        if not band:
+            ys = map(operator.sub, repeat(offset), map(operator.mul, series, repeat(scale)))
+            return list(map(QPointF, self._x_coords(len(series), w), ys)), False
+        xs = self._x_coords(columns, w)
+        half_pen = self.PEN_WIDTH / 2
+        upper = list(map(QPointF, xs, map(operator.sub, repeat(offset - half_pen),
+                                          map(operator.mul, series[columns:], repeat(scale)))))
+        lower = list(map(QPointF, xs, map(operator.sub, repeat(offset + half_pen),
+                                          map(operator.mul, series[:columns], repeat(scale)))))
+        lower.reverse()
+        return upper + lower, True
+
+    @timed_paint
+    def paintEvent(self, event):
+        if len(self.history) < 2:
+            return
+
+        painter = QPainter(self)
+        w, h = self.width(), self.height()
+        if self._t < 1.0:
+            self._draw_series(painter, w, h)
+            return
+
+        # Static frame: rebuild the cached layer only when data, size, DPR or color changed
+        dpr = self.devicePixelRatioF()
+        key = (self._data_version, w, h, dpr, self._is_up(), self.antialias, self.max_points,
+               tuple(sorted(self.levels.items())))
+        if self._cache_key != key:
+            self._cache = QPixmap(round(w * dpr), round(h * dpr))
+            self._cache.setDevicePixelRatio(dpr)
+            self._cache.fill(Qt.GlobalColor.transparent)
+            cache_painter = QPainter(self._cache)
+            self._draw_series(cache_painter, w, h)
+            cache_painter.end()
+            self._cache_key = key
+        painter.drawPixmap(0, 0, self._cache)
+
+    def _is_up(self) -> bool:
+        return self.history.last() >= self.history.first()
+
+    def _draw_series(self, painter: QPainter, w: int, h: int) -> None:
+        self.path_builds += 1
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, self.antialias)
+        points, band = self._series_points(w, h)
         gradient = QLinearGradient(0, 0, 0, h)
         
         # Set color based on overall trend
-        is_up = self.history[-1] >= self.history[0]
-        color = QColor("#FF3B30") if is_up else QColor("#34C759")
+        color = QColor("#FF3B30") if self._is_up() else QColor("#34C759")
         
-        pen = QPen(color, 4, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
-        painter.setPen(pen)
-
-        for i, p in enumerate(series):
-            x = i * (w / (len(series) - 1))
-            y = h - ((p - min_p) / p_range) * h
-            if i == 0: path.moveTo(x, y)
-            else: path.lineTo(x, y)
-
-        painter.drawPath(path)
+        path = QPainterPath()
+        if band:
+            # Per-column min/max band: one fill instead of stroking thousands of segments
+            path.addPolygon(QPolygonF(points))
+            path.closeSubpath()
+            painter.fillPath(path, color)
+            path = QPainterPath()
+            path.addPolygon(QPolygonF(points[:len(points) // 2]))  # Top edge for the area fill
+        else:
+            path.addPolygon(QPolygonF(points))
+            pen = QPen(color, self.PEN_WIDTH, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
+            painter.setPen(pen)
+            painter.drawPath(path)
         
         # Fill area under path
         fill_path = QPainterPath(path)
@@ -223,50 +941,1292 @@ class TrendChart(QWidget):
         gradient.setColorAt(1, QColor(color.red(), color.green(), color.blue(), 0))
         painter.fillPath(fill_path, gradient)
 
+        # Indicator lines: session open (grey, dashed) and moving average (gold, dotted)
+        offset, scale = self._y_mapping(h)
+        for name, value in self.levels.items():
+            y = offset - value * scale
+            if not 0 <= y <= h:
+                continue
+            style = Qt.PenStyle.DashLine if name == "open" else Qt.PenStyle.DotLine
+            painter.setPen(QPen(QColor("#555555" if name == "open" else "#C8A24A"), 1.5, style))
+            painter.drawLine(QPointF(0, y), QPointF(w, y))
+
+class FetchResult(NamedTuple):
+    """Outcome and timing of a single poll."""
+    payload: Optional[Dict[str, Any]]  # The "datas" block, None on error
+    error: Optional[str]
+    status: int
+    not_modified: bool  # Served from the last payload after a 304
+    reused: bool  # True when no new TCP/TLS connection had to be opened
+    connect_ms: float  # TCP + TLS handshake time, 0 on a reused connection
+    transfer_ms: float  # Request, server wait, body read and JSON decode
+    cpu_ms: float  # CPU time spent by the calling thread
+    body: Optional[bytes] = None  # Raw body of a 200 response, for RecordingSource
+
+    @property
+    def total_ms(self) -> float:
+        return self.connect_ms + self.transfer_ms
+
+def parse_price_body(body) -> tuple:
+    """(payload, error) from the body of a 200 response of the price API."""
+    import json
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and data.get("success") and "resultData" in data:
+        return data["resultData"]["datas"], None
+    return None, "API 返回数据格式错误"
+
+class _TimedConnectionMixin:
+    """Reports handshake time of every new connection back to its fetcher.
+
+    Connections also register with the fetcher, so abort() can shut their sockets down.
+    """
+    fetcher: Optional["PriceFetcher"] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        if self.fetcher is not None:
+            if self.fetcher.cancelled:
+                raise ConnectionAbortedError("fetch cancelled")
+            self.fetcher._connections.add(self)
+        super().connect()
+        if self.fetcher is not None:
+            self.fetcher._connect_seconds += time.perf_counter() - start
+
+_timed_adapter_class = None
+
+def timed_adapter_class() -> type:
+    """HTTPAdapter whose pools build connections that time their own handshake.
+
+    Defined on first use so that importing this module does not load requests.
+    """
+    global _timed_adapter_class
+    if _timed_adapter_class is None:
+        from requests.adapters import HTTPAdapter
+
+        class _TimedAdapter(HTTPAdapter):
+            def __init__(self, fetcher: "PriceFetcher", **kwargs) -> None:
+                self._fetcher = fetcher
+                super().__init__(**kwargs)
+
+            def _time_connections(self, manager):
+                # Subclass whatever pools the manager uses (plain, HTTP proxy or SOCKS)
+                if not getattr(manager, "_timed", False):
+                    pool_classes = {}
+                    for scheme, pool_cls in manager.pool_classes_by_scheme.items():
+                        conn_cls = type(f"_Timed{pool_cls.ConnectionCls.__name__}",
+                                        (_TimedConnectionMixin, pool_cls.ConnectionCls), {"fetcher": self._fetcher})
+                        pool_classes[scheme] = type(f"_Timed{pool_cls.__name__}", (pool_cls,), {"ConnectionCls": conn_cls})
+                    manager.pool_classes_by_scheme = pool_classes
+                    manager._timed = True
+                return manager
+
+            def init_poolmanager(self, *args, **kwargs) -> None:
+                super().init_poolmanager(*args, **kwargs)
+                self._time_connections(self.poolmanager)
+
+            def proxy_manager_for(self, proxy, **proxy_kwargs):
+                # Proxied requests (HTTP(S)_PROXY is honoured by default) use a separate manager
+                return self._time_connections(super().proxy_manager_for(proxy, **proxy_kwargs))
+
+        _timed_adapter_class = _TimedAdapter
+    return _timed_adapter_class
+
+class PriceFetcher:
+    """Keep-alive HTTP client for the price endpoint.
+
+    One requests.Session keeps a small connection pool open between polls, so the
+    TCP+TLS handshake is paid once instead of every 5 seconds. ETag/Last-Modified
+    validators are sent back as conditional headers and a 304 reuses the last payload.
+    abort() may be called from any thread and makes an in-flight fetch return at once.
+    """
+    def __init__(self, url: str = API_URL, timeout: float = 10.0, pool_size: int = 2,
+                 connect_timeout: float = 3.0) -> None:
+        import requests  # Deferred: first used on the worker thread, off the startup path
+        import weakref
+
+        self.url = url
+        self.timeout = timeout
+        # A socket still connecting cannot be aborted, so its wait is kept short
+        self.connect_timeout = min(connect_timeout, timeout)
+        self.session = requests.Session()
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+        adapter = timed_adapter_class()(self, pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._payload: Optional[Dict[str, Any]] = None
+        self._connect_seconds = 0.0
+        self._connections = weakref.WeakSet()  # Every connection the pool has opened
+        self.cancelled = False
+        # Running totals for summary()
+        self.polls = 0
+        self.connections = 0
+        self._total_ms = 0.0
+        self._cpu_ms = 0.0
+
+    def fetch(self) -> FetchResult:
+        headers = {}
+        if self._payload is not None:
+            if self._etag: headers["If-None-Match"] = self._etag
+            if self._last_modified: headers["If-Modified-Since"] = self._last_modified
+
+        self._connect_seconds = 0.0
+        cpu_start = time.thread_time()
+        start = time.perf_counter()
+        payload, error, status, not_modified, body = None, None, 0, False, None
+        try:
+            response = self.session.get(self.url, headers=headers, timeout=(self.connect_timeout, self.timeout))
+            status = response.status_code
+            if status == 304 and self._payload is not None:
+                payload, not_modified = self._payload, True
+            elif status == 200:
+                body = response.content
+                payload, error = parse_price_body(body)
+                if payload is not None:
+                    self._payload = payload
+                    self._etag = response.headers.get("ETag")
+                    self._last_modified = response.headers.get("Last-Modified")
+            else:
+                error = f"HTTP 错误: {status}"
+        except Exception as e:
+            error = "请求已取消" if self.cancelled else f"请求失败: {str(e)}"
+
+        total = time.perf_counter() - start
+        connect = min(self._connect_seconds, total)
+        result = FetchResult(
+            payload=payload, error=error, status=status, not_modified=not_modified,
+            reused=status != 0 and self._connect_seconds == 0.0,
+            connect_ms=connect * 1000, transfer_ms=(total - connect) * 1000,
+            cpu_ms=(time.thread_time() - cpu_start) * 1000, body=body,
+        )
+        self.polls += 1
+        self.connections += 0 if self._connect_seconds == 0.0 else 1
+        self._total_ms += result.total_ms
+        self._cpu_ms += result.cpu_ms
+        return result
+
+    def prime(self, payload: Dict[str, Any], etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Adopt a payload and its validators fetched elsewhere (e.g. by another process)."""
+        self._payload, self._etag, self._last_modified = payload, etag, last_modified
+
+    @property
+    def validators(self) -> tuple:
+        return self._etag, self._last_modified
+
+    def summary(self) -> Dict[str, float]:
+        """Average latency and CPU per poll since the fetcher was created."""
+        n = max(self.polls, 1)
+        return {
+            "polls": self.polls,
+            "connections": self.connections,
+            "avg_total_ms": self._total_ms / n,
+            "avg_cpu_ms": self._cpu_ms / n,
+        }
+
+    def abort(self) -> None:
+        """Cancel for good: shut down every socket, so a blocked connect or read fails now."""
+        import socket
+        self.cancelled = True
+        for conn in list(self._connections):
+            sock = getattr(conn, "sock", None)
+            if sock is not None:
+                # On the raw socket: SSLSocket.shutdown() would tear down TLS state under the reader
+                try: socket.socket.shutdown(sock, socket.SHUT_RDWR)
+                except OSError: pass
+
+    def close(self) -> None:
+        self.session.close()
+
+# Poll outcomes reported to a scheduler
+POLL_CHANGED, POLL_UNCHANGED, POLL_ERROR = "changed", "unchanged", "error"
+
+def is_trading_hours(now: Optional[float] = None) -> bool:
+    """Shanghai Gold Exchange sessions: 09:00-15:30 and 20:00-02:30 Beijing time, Mon-Fri."""
+    t = time.gmtime((time.time() if now is None else now) + 8 * 3600)
+    minutes = t.tm_hour * 60 + t.tm_min
+    if minutes < 150:
+        # After midnight still belongs to the previous weekday's night session
+        return 1 <= t.tm_wday <= 5
+    if t.tm_wday >= 5:
+        return False
+    return 540 <= minutes < 930 or minutes >= 1200
+
+class PollScheduler:
+    """Fixed-interval schedule; subclass and override next_delay() to plug in another policy."""
+    def __init__(self, interval: float = 5.0) -> None:
+        self.interval = interval
+
+    def next_delay(self, outcome: str) -> float:
+        """Seconds to wait before the next poll, given the outcome of the last one."""
+        return self.interval
+
+class AdaptivePollScheduler(PollScheduler):
+    """Backs off on errors and idle prices, snaps back to the base interval on movement.
+
+    - errors: exponential backoff with full jitter, capped at max_backoff
+    - identical payloads: interval grows by idle_growth up to idle_interval
+    - a changed price resets to the base interval
+    - outside trading hours closed_interval is both the base interval and the cap,
+      so neither a changed payload nor recovering from errors speeds polling back up
+    - every delay gets +/- jitter so many desks do not poll in lock-step, and the
+      sliding one-minute window never exceeds max_per_minute requests
+    """
+    def __init__(self, interval: float = 5.0, idle_interval: float = 60.0, closed_interval: float = 300.0,
+                 max_backoff: float = 300.0, idle_growth: float = 1.5, jitter: float = 0.2,
+                 max_per_minute: int = 12, clock: Callable[[], float] = time.monotonic,
+                 trading_hours: Callable[[], bool] = is_trading_hours,
+                 rng: Optional[random.Random] = None) -> None:
+        super().__init__(interval)
+        self.idle_interval = idle_interval
+        self.closed_interval = closed_interval
+        self.max_backoff = max_backoff
+        self.idle_growth = idle_growth
+        self.jitter = jitter
+        self.max_per_minute = max_per_minute
+        self.clock = clock
+        self.trading_hours = trading_hours
+        self.rng = rng or random.Random()
+        self._delay = interval
+        self._errors = 0
+        self._recent: deque = deque()  # Poll timestamps within the last minute
+
+    def next_delay(self, outcome: str) -> float:
+        now = self.clock()
+        self._recent.append(now)
+        while now - self._recent[0] >= 60.0:
+            self._recent.popleft()
+
+        trading = self.trading_hours()
+        base = self.interval if trading else self.closed_interval
+        if outcome == POLL_ERROR:
+            self._errors += 1
+            ceiling = min(self.max_backoff, self.interval * 2 ** self._errors)
+            delay = self.rng.uniform(base, max(base, ceiling))
+        else:
+            self._errors = 0
+            if outcome == POLL_CHANGED:
+                self._delay = base
+            else:
+                cap = self.idle_interval if trading else self.closed_interval
+                self._delay = min(max(self._delay * self.idle_growth, base), cap)
+            delay = self._delay * (1.0 + self.rng.uniform(-self.jitter, self.jitter))
+
+        # Hard cap on requests per minute: wait until the max_per_minute-th newest poll
+        # is a minute old (not the oldest one, which may sit on the boundary)
+        if len(self._recent) >= self.max_per_minute:
+            delay = max(delay, 60.0 - (now - self._recent[-self.max_per_minute]))
+        return delay
+
+class FeedSource(abc.ABC):
+    """Where GoldPriceWorker gets its payloads from.
+
+    open(), poll(), next_delay() and close() run on the worker thread; abort() may be
+    called from any thread and must make a blocked poll() return promptly.
+    """
+    realtime = True  # False: ticks come as fast as the UI takes them (see GoldPriceWorker.max_pending)
+    finished = False  # Set once the source has nothing more to give
+    retry_delay = 0.5  # Wait after a poll() that returned None
+    fresh = True  # False when the last payload is a copy another process fetched
+    on_fetch: Optional[Callable[[FetchResult], None]] = None  # Set by the worker
+
+    def open(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def poll(self) -> Optional[tuple]:
+        """(payload, error) with exactly one of them set, or None for "nothing yet"."""
+
+    @abc.abstractmethod
+    def next_delay(self, outcome: str) -> float:
+        """Seconds until the next poll(), given the outcome of the last one."""
+
+    def abort(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+class LiveSource(FeedSource):
+    """The price API, polled on a scheduler's timetable.
+
+    With a SharedPriceCache a fresh cached payload is used instead of a request, and
+    only the process holding the cache lock fetches; the others follow the cache.
+    """
+    def __init__(self, url: str = API_URL, scheduler: Optional[PollScheduler] = None,
+                 cache: Optional["SharedPriceCache"] = None) -> None:
+        self.url = url
+        self.scheduler = scheduler or AdaptivePollScheduler()
+        self.cache = cache
+        self.cache_hits = 0
+        self._fetcher: Optional[PriceFetcher] = None
+        self._aborted = False
+
+    def open(self) -> None:
+        self._fetcher = PriceFetcher(self.url)
+        if self._aborted:
+            self._fetcher.abort()  # abort() came in while the fetcher was being built
+
+    def poll(self) -> Optional[tuple]:
+        """(payload, error) from the shared cache or the network, None if another process is fetching."""
+        if self.cache is None:
+            return self._fetch()
+        entry = self.cache.read()
+        if self.cache.is_fresh(entry):
+            self.cache_hits += 1
+            self.fresh = False
+            return entry["payload"], None
+        if not self.cache.try_lock():
+            return None
+        try:
+            # Someone may have refreshed it between our read and taking the lock
+            entry = self.cache.read()
+            if self.cache.is_fresh(entry):
+                self.cache_hits += 1
+                self.fresh = False
+                return entry["payload"], None
+            if entry is not None and self._fetcher.polls == 0:
+                self._fetcher.prime(entry["payload"], entry.get("etag"), entry.get("last_modified"))
+            payload, error = self._fetch()
+            if payload is not None:
+                self.cache.write(payload, *self._fetcher.validators)
+            return payload, error
+        finally:
+            self.cache.unlock()
+
+    def _fetch(self) -> tuple:
+        self.fresh = True
+        result = self._fetcher.fetch()
+        if self.on_fetch is not None:
+            self.on_fetch(result)
+        return result.payload, result.error
+
+    def next_delay(self, outcome: str) -> float:
+        return self.scheduler.next_delay(outcome)
+
+    def abort(self) -> None:
+        self._aborted = True
+        fetcher = self._fetcher
+        if fetcher is not None:
+            fetcher.abort()
+
+    def close(self) -> None:
+        if self._fetcher is not None:
+            self._fetcher.close()
+
+class RecordingSource(FeedSource):
+    """Passes another source through and appends every poll to a capture file.
+
+    A capture is JSON lines with the wall time "t" of each poll. A network poll stores
+    the HTTP "status" and, for a 200, the response "body" as received; a payload that
+    did not come from a request is stored as "payload", with "cached": true when it was
+    a shared-cache copy of another process's fetch. ReplaySource plays it back.
+    If the capture file cannot be opened the inner source still runs, unrecorded.
+    """
+    def __init__(self, inner: FeedSource, path: str) -> None:
+        self.inner = inner
+        self.path = path
+        self.realtime = inner.realtime
+        self.retry_delay = inner.retry_delay
+        self.records = 0
+        self._file = None
+        self._result: Optional[FetchResult] = None
+
+    def open(self) -> None:
+        import json
+        self._dumps = json.dumps
+        self.inner.on_fetch = self._on_fetch
+        self.inner.open()
+        try:
+            self._file = open(self.path, "a", encoding="utf-8", buffering=1)  # Line buffered
+        except OSError:
+            self._file = None  # Unwritable capture: keep the feed, just don't record it
+
+    def _on_fetch(self, result: FetchResult) -> None:
+        self._result = result
+        if self.on_fetch is not None:
+            self.on_fetch(result)
+
+    def _record(self, payload: Optional[Dict[str, Any]], error: Optional[str]) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"t": time.time()}
+        result = self._result
+        if result is not None:
+            record["status"] = result.status
+            if result.body is not None:
+                record["body"] = result.body.decode("utf-8", "replace")
+            elif not result.not_modified:
+                record["error"] = result.error
+        elif payload is not None:
+            record["payload"] = payload
+            if not self.inner.fresh:
+                record["cached"] = True
+        else:
+            record["error"] = error
+        return record
+
+    def poll(self) -> Optional[tuple]:
+        self._result = None
+        polled = self.inner.poll()
+        self.finished = self.inner.finished
+        self.fresh = self.inner.fresh
+        if polled is not None and self._file is not None:
+            self._file.write(self._dumps(self._record(*polled), ensure_ascii=False) + "\n")
+            self.records += 1
+        return polled
+
+    def next_delay(self, outcome: str) -> float:
+        return self.inner.next_delay(outcome)
+
+    def abort(self) -> None:
+        self.inner.abort()
+
+    def close(self) -> None:
+        try:
+            self.inner.close()
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class ReplaySource(FeedSource):
+    """Plays a capture back with its original spacing divided by `speed`.
+
+    speed=1 is real time, speed=N is N times faster and speed=0 replays as fast as the
+    consumer keeps up. With loop=True the capture restarts at its end, for soak tests.
+    Records are read one line at a time, so captures of any length replay in constant memory.
+    Every payload carries its recorded time under TICK_TIME, so indicators, the pyramid
+    and the tick log see the capture's timeline whatever the speed; each loop continues
+    it from the previous pass's last record.
+    """
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False) -> None:
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.realtime = speed > 0
+        self.retry_delay = 0.0
+        self.replayed = 0
+        self._file = None
+        self._next: Optional[Dict[str, Any]] = None
+        self._delay = 0.0
+        self._payload: Optional[Dict[str, Any]] = None  # What a recorded 304 repeats
+        self._offset = 0.0  # Added to "t" so a looped capture keeps moving forward in time
+        self._last_t: Optional[float] = None
+
+    def open(self) -> None:
+        import json
+        self._loads = json.loads
+        self._file = open(self.path, "r", encoding="utf-8")
+        self._next = self._read()
+        self.finished = self._next is None
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        rewound = False
+        while True:
+            line = self._file.readline()
+            if not line:
+                if not self.loop or rewound:
+                    return None
+                self._file.seek(0)
+                rewound = True
+                continue
+            try:
+                record = self._loads(line)
+            except ValueError:
+                continue  # Torn last line of a capture that was still being written
+            if isinstance(record, dict) and isinstance(record.get("t"), (int, float)):
+                if rewound and self._last_t is not None:
+                    self._offset = self._last_t - record["t"]
+                    rewound = False
+                record["t"] += self._offset
+                self._last_t = record["t"]
+                return record
+
+    def poll(self) -> Optional[tuple]:
+        record, self._next = self._next, self._read()
+        if record is None:
+            self.finished = True
+            return None
+        self.replayed += 1
+        self.finished = self._next is None
+        if self.speed > 0 and self._next is not None:
+            self._delay = max(0.0, (self._next["t"] - record["t"]) / self.speed)
+        else:
+            self._delay = 0.0
+        self.fresh = not record.get("cached", False)
+        if "body" in record:
+            payload, error = parse_price_body(record["body"])
+        elif record.get("status") == 304 and self._payload is not None:
+            payload, error = self._payload, None
+        else:
+            payload, error = record.get("payload"), record.get("error") or "请求失败"
+        if payload is None:
+            return None, error
+        self._payload = payload
+        return dict(payload, **{TICK_TIME: record["t"]}), None
+
+    def next_delay(self, outcome: str) -> float:
+        return self._delay
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
 class GoldPriceWorker(QThread):
-    """Worker thread to fetch gold price data every 5 seconds."""
+    """Worker thread that emits what its FeedSource yields, by default the live API.
+
+    For sources that are not real time, max_pending bounds how many payloads may be
+    emitted before the receiver calls acknowledge(), so a fast replay cannot flood
+    the GUI thread's event queue.
+    """
     data_received = Signal(dict)
+    data_fetched = Signal(dict)  # The data_received payloads this process fetched itself
     error_occurred = Signal(str)
+    fetch_timing = Signal(object)  # FetchResult of every poll
 
-    def __init__(self) -> None:
+    def __init__(self, url: str = API_URL, scheduler: Optional[PollScheduler] = None,
+                 cache: Optional["SharedPriceCache"] = None, source: Optional[FeedSource] = None,
+                 max_pending: int = 64) -> None:
         super().__init__()
+        self.source = source or LiveSource(url, scheduler, cache)
+        self.max_pending = 0 if self.source.realtime else max_pending
+        self._slots = threading.Semaphore(self.max_pending)
         self._running = True
+        self._wake = threading.Event()
 
     def stop(self) -> None:
+        """Ask the thread to finish; a sleep or an in-flight request ends immediately."""
         self._running = False
+        self._wake.set()
+        self._slots.release()
+        self.source.abort()
+
+    def acknowledge(self) -> None:
+        """The receiver is done with one payload (only counts when max_pending is set)."""
+        if self.max_pending:
+            self._slots.release()
+
+    def _on_fetch(self, result: FetchResult) -> None:
+        self.fetch_timing.emit(result)
+        if METRICS.enabled: METRICS.record_fetch(result)
 
     def run(self) -> None:
-        while self._running:
+        source = self.source
+        source.on_fetch = self._on_fetch
+        last_payload = None
+        try:
             try:
-                response = requests.get(API_URL, timeout=10)
+                source.open()
+            except OSError as e:
+                # e.g. a replay capture that does not exist
+                self.error_occurred.emit(f"数据源打开失败: {e}")
+                return
+            if not self._running:
+                source.abort()  # stop() came in while the source was opening
+            while self._running and not source.finished:
+                polled = source.poll()
                 if not self._running: break
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success") and "resultData" in data:
-                        self.data_received.emit(data["resultData"]["datas"])
-                    else:
-                        self.error_occurred.emit("API 返回数据格式错误")
+                if polled is None:
+                    # e.g. another process is fetching right now; look again shortly
+                    self._wake.wait(source.retry_delay)
+                    continue
+                payload, error = polled
+                if payload is not None:
+                    outcome = POLL_UNCHANGED if payload == last_payload else POLL_CHANGED
+                    last_payload = payload
+                    if self.max_pending:
+                        self._slots.acquire()
+                        if not self._running: break
+                    if METRICS.enabled: METRICS.mark_emit()
+                    self.data_received.emit(payload)
+                    if source.fresh:
+                        self.data_fetched.emit(payload)
                 else:
-                    self.error_occurred.emit(f"HTTP 错误: {response.status_code}")
-            except Exception as e:
-                if self._running:
-                    self.error_occurred.emit(f"请求失败: {str(e)}")
-            
-            # Wait for 5 seconds in small increments to remain responsive to stop
-            for _ in range(50):
-                if not self._running: break
-                time.sleep(0.1)
+                    outcome = POLL_ERROR
+                    self.error_occurred.emit(error)
+
+                # Sleep until the next poll; stop() wakes us immediately
+                delay = source.next_delay(outcome)
+                if delay > 0:
+                    self._wake.wait(delay)
+        finally:
+            source.close()
+
+def app_data_dir() -> str:
+    """Per-user data directory (GOLD_SAVER_DATA_DIR overrides it)."""
+    path = os.environ.get("GOLD_SAVER_DATA_DIR")
+    if not path:
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+        path = os.path.join(base, "GoldPriceSaver")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def lock_file(f, blocking: bool = True) -> bool:
+    """Exclusive lock on an open file, held against other processes until unlock_file().
+
+    Non-blocking, returns False if another process holds it; blocking, waits (msvcrt
+    gives up after about 10s and raises OSError).
+    """
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+def unlock_file(f) -> None:
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+# timestamp, price, upAndDownAmt, upAndDownRate (in percent)
+TICK_RECORD = struct.Struct("<dddd")
+
+# Payload key a replayed tick carries its recorded wall time in, see ReplaySource
+TICK_TIME = "_tickTime"
+
+def parse_tick(data: Dict[str, Any], timestamp: Optional[float] = None) -> Optional[tuple]:
+    """Turn an API payload into a TICK_RECORD tuple, None if it is malformed.
+
+    The timestamp is, in order of preference, the argument, the payload's TICK_TIME
+    and the current time.
+    """
+    if timestamp is None:
+        timestamp = data.get(TICK_TIME)
+    try:
+        return (
+            time.time() if timestamp is None else float(timestamp),
+            float(data["price"]),
+            float(data.get("upAndDownAmt", "0")),
+            float(str(data.get("upAndDownRate", "0%")).rstrip("%")),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def tick_payload(tick: tuple) -> Dict[str, Any]:
+    """Rebuild an API-shaped payload from a stored tick."""
+    _, price, amt, rate = tick
+    return {"price": f"{price:.2f}", "upAndDownAmt": f"{amt:+.2f}", "upAndDownRate": f"{rate:+.2f}%"}
+
+class TickStore:
+    """Append-only log of fixed-size tick records, split into rotating segment files.
+
+    Segments are named ticks-NNNNNN.bin and hold segment_records records each; once
+    more than max_segments exist the oldest is deleted, so disk use stays bounded.
+    Reads memory-map the segments, so loading the tail costs one copy of the records.
+    Several saver processes may share the directory: appends, rotation and pruning
+    happen under a lock on ticks.lock and always continue the newest segment on disk.
+    """
+    def __init__(self, directory: str, segment_records: int = 65536, max_segments: int = 4) -> None:
+        self.directory = directory
+        self.segment_records = segment_records
+        self.max_segments = max_segments
+        os.makedirs(directory, exist_ok=True)
+        self._file = None
+        self._lock = None
+        self._segment = 0
+        self._records = 0
+
+    def _segments(self) -> list:
+        """(index, path) of every segment, oldest first."""
+        found = []
+        for name in os.listdir(self.directory):
+            if name.startswith("ticks-") and name.endswith(".bin"):
+                try: found.append((int(name[6:-4]), os.path.join(self.directory, name)))
+                except ValueError: pass
+        return sorted(found)
+
+    def _open_segment(self, index: int) -> None:
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f"ticks-{index:06d}.bin")
+        self._file = open(path, "ab")
+        # Drop a torn record left behind by a killed process
+        size = self._file.tell()
+        if size % TICK_RECORD.size:
+            self._file.truncate(size - size % TICK_RECORD.size)
+        self._segment = index
+        self._records = self._file.tell() // TICK_RECORD.size
+
+        segments = self._segments()
+        for _, old in segments[:max(0, len(segments) - self.max_segments)]:
+            try: os.remove(old)
+            except OSError: pass  # Still open in another saver process
+
+    def append(self, tick: tuple) -> None:
+        if self._lock is None:
+            self._lock = open(os.path.join(self.directory, "ticks.lock"), "a+b")
+        lock_file(self._lock)
+        try:
+            # Another process may have appended or rotated since our last write
+            segments = self._segments()
+            newest = segments[-1][0] if segments else 1
+            if self._file is None or newest != self._segment:
+                self._open_segment(newest)
+            else:
+                self._records = self._file.seek(0, os.SEEK_END) // TICK_RECORD.size
+            if self._records >= self.segment_records:
+                self._open_segment(self._segment + 1)
+            self._file.write(TICK_RECORD.pack(*tick))
+            self._file.flush()
+            self._records += 1
+        finally:
+            unlock_file(self._lock)
+
+    @staticmethod
+    def _read_segment(path: str, last_n: Optional[int] = None) -> list:
+        count = os.path.getsize(path) // TICK_RECORD.size
+        if count == 0:
+            return []
+        first = 0 if last_n is None else max(0, count - last_n)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return list(TICK_RECORD.iter_unpack(mm[first * TICK_RECORD.size:count * TICK_RECORD.size]))
+
+    def tail(self, n: int) -> list:
+        """The newest n ticks, oldest first."""
+        ticks: list = []
+        for _, path in reversed(self._segments()):
+            try: ticks = self._read_segment(path, n - len(ticks)) + ticks
+            except (OSError, ValueError): continue
+            if len(ticks) >= n:
+                break
+        return ticks
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+class SharedPriceCache:
+    """Last payload shared by every saver process of the user, with a TTL.
+
+    Windows starts the /p preview and the /s saver back to back. Instead of each one
+    polling the API, the process that takes the non-blocking lock on the .lock file
+    fetches and atomically replaces the .json file. The others read it, so a new
+    process has a price immediately, whatever its age, and revalidates in the background.
+    """
+    def __init__(self, directory: str, ttl: float = 4.0) -> None:
+        self.path = os.path.join(directory, "price-cache.json")
+        self.ttl = ttl
+        self._lock_file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """The cached entry (fetched_at, payload, etag, last_modified), None if missing or torn."""
+        import json
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("payload"), dict):
+            return None
+        return entry
+
+    def is_fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return entry is not None and 0 <= time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def write(self, payload: Dict[str, Any], etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        import json
+        entry = {"fetched_at": time.time(), "payload": payload, "etag": etag, "last_modified": last_modified}
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self.path)  # Readers see the old or the new file, never half of one
+        except OSError:
+            try: os.remove(tmp)
+            except OSError: pass
+
+    def try_lock(self) -> bool:
+        """Become the fetcher; False if another process holds the lock."""
+        if self._lock_file is not None:
+            return True
+        try:
+            f = open(self.path[:-len(".json")] + ".lock", "a+b")
+        except OSError:
+            return True  # No lock file possible (read-only dir): just fetch
+        if not lock_file(f, blocking=False):
+            f.close()
+            return False
+        self._lock_file = f
+        return True
+
+    def unlock(self) -> None:
+        f, self._lock_file = self._lock_file, None
+        if f is None:
+            return
+        unlock_file(f)
+        f.close()
+
+# Selectable chart ranges in seconds; "live" is the animated last-CHART_CAPACITY-ticks view
+CHART_RANGES = {"live": 0, "1h": 3600, "1d": 86400, "1w": 7 * 86400}
+CHART_RANGE_LABELS = {"live": "实时", "1h": "1 小时", "1d": "1 天", "1w": "1 周"}
+
+class MinMaxPyramid:
+    """Incrementally maintained min/max buckets over the tick stream at several resolutions.
+
+    Level 0 holds raw ticks, coarser levels one bucket per bucket_seconds. Each bucket
+    keeps its low and high together with when they happened, so a decimated view emits
+    them in time order and spikes keep their shape. append() is O(levels) and query()
+    only walks the buckets it returns, so both are O(pixels) rather than O(ticks).
+    """
+    def __init__(self, bucket_seconds: tuple = (0, 30, 120, 900), depth: int = 4096) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.depth = depth
+        # Buckets are [start, low, low_ts, high, high_ts]
+        self.levels = [deque(maxlen=depth) for _ in bucket_seconds]
+
+    def append(self, timestamp: float, price: float) -> None:
+        for size, level in zip(self.bucket_seconds, self.levels):
+            start = timestamp - timestamp % size if size else timestamp
+            if level and level[-1][0] == start:
+                bucket = level[-1]
+                if price < bucket[1]: bucket[1], bucket[2] = price, timestamp
+                if price > bucket[3]: bucket[3], bucket[4] = price, timestamp
+            else:
+                level.append([start, price, timestamp, price, timestamp])
+
+    def query(self, seconds: float, budget: int) -> list:
+        """Prices covering the last `seconds`, decimated to roughly `budget` points."""
+        if not self.levels[0]:
+            return []
+        since = self.levels[0][-1][0] - seconds
+        coarsest = self.levels[-1]
+        for size, level in zip(self.bucket_seconds, self.levels):
+            # A level that has already dropped part of the range cannot serve it
+            if level is not coarsest and len(level) == self.depth and level[0][0] > since:
+                continue
+            points_per_bucket = 2 if size else 1
+            buckets = []
+            for bucket in reversed(level):
+                if bucket[0] + size < since:
+                    break
+                if level is not coarsest and (len(buckets) + 1) * points_per_bucket > budget:
+                    break  # Too fine for this range, try the next level
+                buckets.append(bucket)
+            else:
+                return self._flatten(reversed(buckets), size)
+            if bucket[0] + size < since:
+                return self._flatten(reversed(buckets), size)
+        return []
+
+    @staticmethod
+    def _flatten(buckets, size: float) -> list:
+        prices = []
+        for _, low, low_ts, high, high_ts in buckets:
+            if not size or low == high:
+                prices.append(low)
+            elif low_ts <= high_ts:
+                prices += (low, high)
+            else:
+                prices += (high, low)
+        return prices
+
+class PriceBus(QObject):
+    """In-process price feed: one worker fetches, every window on every screen subscribes.
+
+    The last payload is cached so a subscriber that joins late (e.g. a monitor
+    hot-plugged at runtime) is painted immediately instead of waiting for the next poll.
+    With a TickStore attached every payload this process fetched is logged (copies
+    read from the shared cache are not), and warm_start() replays the
+    tail of the log so windows show a price before the first fetch completes. A
+    SharedPriceCache, if newer than the log, supplies that first price instead.
+    """
+    tick = Signal(dict)
+    error = Signal(str)
+    pyramid_ready = Signal()  # enable_pyramid() finished seeding self.pyramid
+    _pyramid_seeded = Signal(object)
+
+    def __init__(self, store: Optional[TickStore] = None, cache: Optional[SharedPriceCache] = None,
+                 url: str = API_URL, source: Optional[FeedSource] = None,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.url = url
+        self.source = source  # None: the live API
+        self.store = store
+        self.cache = cache
+        self.latest: Optional[Dict[str, Any]] = None
+        self.recent: deque = deque(maxlen=CHART_CAPACITY)  # Prices for seeding new charts
+        self._latest_in_recent = False  # recent[-1] is the price of latest
+        self.pyramid: Optional[MinMaxPyramid] = None  # Built on demand for long-range views
+        self._unseeded: Optional[list] = None  # Ticks published while the pyramid is being seeded
+        self._pyramid_seeded.connect(self._adopt_pyramid)
+        self.indicators = StreamingIndicators(CHART_CAPACITY)  # Shared by every window
+        self.worker: Optional[GoldPriceWorker] = None
+
+    def warm_start(self) -> None:
+        ticks = []
+        if self.store is not None:
+            try: ticks = self.store.tail(CHART_CAPACITY)
+            except OSError: pass
+        if ticks:
+            self.recent.extend(t[1] for t in ticks)
+            for tick in ticks:
+                self.indicators.push(tick[1], tick[0])
+            self.latest = tick_payload(ticks[-1])
+            self._latest_in_recent = True
+        # Stale-while-revalidate: show the shared payload whatever its age, the worker refreshes it
+        entry = self.cache.read() if self.cache is not None else None
+        if entry is not None and (not ticks or entry.get("fetched_at", 0) > ticks[-1][0]):
+            self.latest = entry["payload"]
+            self._latest_in_recent = False
+
+    def chart_seed(self) -> list:
+        """Prices to seed a new chart with: recent, minus latest if it is in there,
+        since subscribe() delivers that one straight away."""
+        prices = list(self.recent)
+        return prices[:-1] if self._latest_in_recent else prices
+
+    def enable_pyramid(self, seconds: float) -> None:
+        """Build the downsampling pyramid, seeded with up to `seconds` of logged ticks.
+
+        Reading and bucketing the log is O(ticks), so it runs on a thread: the windows
+        paint straight away and pyramid_ready fires once self.pyramid can be queried.
+        """
+        if self.pyramid is not None or self._unseeded is not None:
+            return
+        if self.store is None:
+            self.pyramid = MinMaxPyramid()
+            self.pyramid_ready.emit()
+            return
+        self._unseeded = []
+        threading.Thread(target=self._seed_pyramid, args=(seconds,), name="pyramid-seed", daemon=True).start()
+
+    def _seed_pyramid(self, seconds: float) -> None:
+        pyramid = MinMaxPyramid()
+        try: ticks = self.store.tail(self.store.segment_records * self.store.max_segments)
+        except OSError: ticks = []
+        since = time.time() - seconds
+        for tick in ticks:
+            if tick[0] >= since:
+                pyramid.append(tick[0], tick[1])
+        self._pyramid_seeded.emit(pyramid)  # Queued to the bus's thread
+
+    def _adopt_pyramid(self, pyramid: MinMaxPyramid) -> None:
+        # Ticks published meanwhile may or may not have made it into the log it read
+        newest = pyramid.levels[0][-1][0] if pyramid.levels[0] else float("-inf")
+        for timestamp, price in self._unseeded:
+            if timestamp > newest:
+                pyramid.append(timestamp, price)
+        self._unseeded = None
+        self.pyramid = pyramid
+        self.pyramid_ready.emit()
+
+    def start(self) -> None:
+        if self.worker is not None:
+            return
+        self.worker = GoldPriceWorker(self.url, cache=self.cache, source=self.source)
+        self.worker.data_received.connect(self._publish)
+        self.worker.data_fetched.connect(self._log)
+        self.worker.error_occurred.connect(self.error)
+        self.worker.start()
+
+    def stop(self, timeout_ms: int = 300) -> bool:
+        """Stop the worker (aborting any request) and close the log; False if it did not finish in time."""
+        finished = True
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.stop()
+            finished = self.worker.wait(timeout_ms)
+        if self.store is not None:
+            self.store.close()
+        return finished
+
+    def subscribe(self, on_tick: Callable[[Dict[str, Any]], None],
+                  on_error: Optional[Callable[[str], None]] = None) -> None:
+        self.tick.connect(on_tick)
+        if on_error is not None:
+            self.error.connect(on_error)
+        if self.latest is not None:
+            on_tick(self.latest)
+
+    def _log(self, data: Dict[str, Any]) -> None:
+        # Only payloads this process fetched: a copy read from the shared cache was
+        # already logged by the process that fetched it
+        tick = parse_tick(data)
+        if tick is not None and self.store is not None:
+            try: self.store.append(tick)
+            except OSError: pass
+
+    def _publish(self, data: Dict[str, Any]) -> None:
+        if METRICS.enabled: METRICS.mark_receive()
+        self.latest = data
+        tick = parse_tick(data)
+        self._latest_in_recent = tick is not None
+        if tick is not None:
+            self.recent.append(tick[1])
+            self.indicators.push(tick[1], tick[0])
+            if self.pyramid is not None:
+                self.pyramid.append(tick[0], tick[1])
+            elif self._unseeded is not None:
+                self._unseeded.append((tick[0], tick[1]))
+        self.tick.emit(data)
+        if self.worker is not None:
+            self.worker.acknowledge()
+
+class InputWatcher(QObject):
+    """Process-wide dismissal trigger shared by every screensaver window.
+
+    It filters events on each window's QWindow, which sees keyboard and mouse input
+    before any widget does, so nothing needs to be polled while input is delivered
+    normally. An optional coarse cursor poll (one timer for the whole process)
+    backs it up. The time from the triggering input to exit is recorded for tuning.
+    """
+    activity = Signal()
+    _instance: Optional["InputWatcher"] = None
+
+    def __init__(self, fallback_poll_ms: int = 250, move_threshold: int = 2, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.move_threshold = move_threshold
+        self._origin = QCursor.pos()
+        self.input_at: Optional[float] = None  # perf_counter() of the dismissing input
+        self.wakeups = 0  # Fallback polls so far
+        self._poll = QTimer(self)
+        self._poll.setTimerType(Qt.TimerType.CoarseTimer)
+        self._poll.timeout.connect(self._poll_cursor)
+        if fallback_poll_ms > 0:
+            self._poll.start(fallback_poll_ms)
+
+    @classmethod
+    def instance(cls) -> "InputWatcher":
+        if cls._instance is None:
+            cls._instance = InputWatcher(parent=QApplication.instance())
+        return cls._instance
+
+    def watch(self, widget: QWidget) -> None:
+        widget.winId()  # Make sure the native window exists
+        widget.windowHandle().installEventFilter(self)
+
+    def exit_latency_ms(self) -> Optional[float]:
+        """Milliseconds since the dismissing input, None if nothing triggered yet."""
+        if self.input_at is None:
+            return None
+        return (time.perf_counter() - self.input_at) * 1000
+
+    def eventFilter(self, obj: QObject, event) -> bool:
+        etype = event.type()
+        if etype in (QEvent.Type.KeyPress, QEvent.Type.MouseButtonPress, QEvent.Type.Wheel):
+            self._trigger()
+        elif etype == QEvent.Type.MouseMove:
+            # Ignore jitter and the synthetic move some platforms send on show
+            if (event.globalPosition().toPoint() - self._origin).manhattanLength() > self.move_threshold:
+                self._trigger()
+        return False
+
+    def _poll_cursor(self) -> None:
+        self.wakeups += 1
+        if (QCursor.pos() - self._origin).manhattanLength() > self.move_threshold:
+            self._trigger()
+
+    def _trigger(self) -> None:
+        if self.input_at is None:
+            self.input_at = time.perf_counter()
+            self._poll.stop()
+            self.activity.emit()
+
+class DebugOverlay(QLabel):
+    """On-screen readout of METRICS, refreshed once a second (metrics mode only)."""
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+        self.setStyleSheet("color: #00FF88; background-color: rgba(0, 0, 0, 160);"
+                           "font-family: Consolas, monospace; font-size: 12px; padding: 6px;")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(1000)
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.setText("\n".join(METRICS.summary_lines()))
+        self.adjustSize()
+        self.raise_()
+
+class DriftScene(QWidget):
+    """Opaque black container for everything SceneDrift moves.
+
+    It paints its own background instead of inheriting the stage's style sheet, so
+    Qt knows it covers its whole rectangle and can move it by scrolling pixels.
+    """
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+    def paintEvent(self, event):
+        QPainter(self).fillRect(event.rect(), Qt.GlobalColor.black)
+
+class SceneDrift(QObject):
+    """Slow, continuous anti-burn-in drift of a scene widget inside its stage.
+
+    The scene is sized once to the stage minus the drift margin and afterwards only
+    moved. A move keeps the size, so the scene's layout is never recomputed, and
+    because the scene is opaque (see DriftScene) the backing store scrolls its
+    already-rendered pixels: only the strip of stage it uncovers is repainted, none
+    of the scene's children. The path is a slow Lissajous curve in whole pixels.
+    """
+    moved = Signal()
+
+    def __init__(self, stage: QWidget, scene: QWidget, amplitude: int = 24,
+                 period_s: float = 600.0, step_ms: int = 1000) -> None:
+        super().__init__(stage)
+        self.stage = stage
+        self.scene = scene
+        self.amplitude = amplitude
+        self.period_s = period_s
+        self.moves = 0
+        self._t0 = time.monotonic()
+        stage.installEventFilter(self)
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._timer.timeout.connect(self.step)
+        if amplitude > 0:
+            self._timer.start(step_ms)
+
+    def offset(self, t: float) -> QPoint:
+        phase = 2 * math.pi * t / self.period_s
+        a = self.amplitude
+        return QPoint(a + round(a * math.sin(phase)), a + round(a * math.sin(phase * 1.37 + 1.1)))
+
+    def step(self) -> None:
+        pos = self.offset(time.monotonic() - self._t0)
+        if pos != self.scene.pos():
+            self.scene.move(pos)
+            self.moves += 1
+            self.moved.emit()
+
+    def eventFilter(self, obj: QObject, event) -> bool:
+        if event.type() == QEvent.Type.Resize:
+            margin = 2 * self.amplitude
+            self.scene.resize(max(0, self.stage.width() - margin), max(0, self.stage.height() - margin))
+            self.scene.move(self.offset(time.monotonic() - self._t0))
+        return False
+
+class QualityTier(NamedTuple):
+    """One step of render fidelity."""
+    name: str
+    fps: int
+    antialias: bool
+    roll_ms: int  # Price digit roll duration
+    chart_ms: int  # Chart series tween duration
+    chart_points: int  # Max points in the chart, 0 = one column per four pixels
+
+QUALITY_TIERS = (
+    QualityTier("full", 60, True, 1200, 900, 0),
+    QualityTier("balanced", 30, True, 900, 600, 400),
+    QualityTier("low", 15, False, 500, 300, 120),
+)
+
+class QualityGovernor(QObject):
+    """Picks a QualityTier for a window from its size and its measured frame times.
+
+    Small windows (the /p preview) are capped at the lowest tier. While animating,
+    the governor keeps a rolling window of frame intervals from the window's
+    FrameClock: if more than a quarter of them run late it steps one tier down, and
+    after several clean windows in a row it steps back up towards the size cap.
+    """
+    changed = Signal(object)
+
+    def __init__(self, window: QWidget, clock: "FrameClock", pinned: Optional[int] = None,
+                 sample_frames: int = 60, late_ratio: float = 0.25, recover_windows: int = 4) -> None:
+        super().__init__(window)
+        self.window = window
+        self.clock = clock
+        self.late_ratio = late_ratio
+        self.recover_windows = recover_windows
+        self.level = self.ceiling = pinned or 0
+        self._samples: deque = deque(maxlen=sample_frames)
+        self._clean = 0
+        # A pinned tier (quality/tier setting) switches the automatic choice off
+        if pinned is None:
+            self.level = self.ceiling = self.ceiling_for(window.width(), window.height())
+            clock.frame.connect(self._on_frame)
+            window.installEventFilter(self)
+
+    @property
+    def tier(self) -> QualityTier:
+        return QUALITY_TIERS[self.level]
+
+    @staticmethod
+    def ceiling_for(width: int, height: int) -> int:
+        return len(QUALITY_TIERS) - 1 if width * height < 400 * 300 else 0
+
+    def _set_level(self, level: int) -> None:
+        level = max(self.ceiling, min(len(QUALITY_TIERS) - 1, level))
+        self._samples.clear()
+        self._clean = 0
+        if level != self.level:
+            self.level = level
+            self.changed.emit(self.tier)
+
+    def eventFilter(self, obj: QObject, event) -> bool:
+        if event.type() == QEvent.Type.Resize:
+            ceiling = self.ceiling_for(self.window.width(), self.window.height())
+            if ceiling != self.ceiling:
+                raised = ceiling < self.ceiling
+                self.ceiling = ceiling
+                # Grown past the small-window cap: start at the new ceiling instead of
+                # waiting for clean frames; shrunk: never stay above the cap
+                self._set_level(ceiling if raised else max(self.level, ceiling))
+        return False
+
+    def _on_frame(self) -> None:
+        interval = self.clock.last_interval_ms
+        if interval <= 0:
+            return
+        self._samples.append(interval)
+        if len(self._samples) < self._samples.maxlen:
+            return
+        budget = 1000.0 / self.tier.fps
+        late = sum(1 for ms in self._samples if ms > budget * 1.5)
+        if late > len(self._samples) * self.late_ratio:
+            self._set_level(self.level + 1)
+        elif late == 0:
+            self._clean += 1
+            self._samples.clear()
+            if self._clean >= self.recover_windows and self.level > self.ceiling:
+                self._set_level(self.level - 1)
+        else:
+            self._clean = 0
+            self._samples.clear()
 
 class ScreenSaverWindow(QMainWindow):
     """The main fullscreen window for the screensaver."""
     
-    def __init__(self, is_preview: bool = False, run_worker: bool = True) -> None:
+    def __init__(self, bus: PriceBus, is_preview: bool = False) -> None:
         super().__init__()
         self.is_preview = is_preview
-        self.run_worker = run_worker
-        self.last_mouse_pos: Optional[QPoint] = None
-        self._cursor_last_pos: Optional[QPoint] = None
+        self.bus = bus
         self._exiting = False
+        # Mirror mode: scene snapshot shared with MirrorWindows on other screens
+        self.mirror_frame: Optional[QPixmap] = None
+        self.primary_view: Optional["MirrorWindow"] = None  # Shows mirror_frame on this screen
+        self._mirrors: list = []
+        self._mirror_pending = False
+        # Off screen nothing repaints on its own; catches the once-a-second changes
+        # (debug overlay, governor) that neither a tick nor a clock frame announce
+        self._mirror_refresh = QTimer(self)
+        self._mirror_refresh.setInterval(1000)
+        self._mirror_refresh.timeout.connect(self._schedule_mirror)
         
         # Configure window properties
         self.setWindowTitle("实时金价windows屏保")
@@ -282,33 +2242,42 @@ class ScreenSaverWindow(QMainWindow):
         
         self.init_ui()
 
-        self.setMouseTracking(True)
-        self.central_widget.setMouseTracking(True)
-        for w in (self.price_widget, self.chart):
-            w.setMouseTracking(True)
-
+        # Exit triggers are handled process-wide instead of per window
         if not self.is_preview:
-            self._cursor_timer = QTimer(self)
-            self._cursor_timer.setInterval(50)
-            self._cursor_timer.timeout.connect(self._poll_cursor)
-            self._cursor_timer.start()
+            watcher = InputWatcher.instance()
+            watcher.watch(self)
+            watcher.activity.connect(self.close_and_exit)
         
-        # Only start worker thread on the main window to save resources and avoid exit issues
-        if self.run_worker:
-            self.worker = GoldPriceWorker()
-            self.worker.data_received.connect(self.update_price)
-            self.worker.error_occurred.connect(self.handle_error)
-            self.worker.start()
+        # All windows share the bus's single worker; no window fetches on its own.
+        # The chart is seeded with everything but the newest price, which subscribe()
+        # delivers straight away through update_price.
+        self.chart_range = setting("chart/range", "live")
+        if CHART_RANGES.get(self.chart_range):
+            # Long-range views appear once the bus has seeded its pyramid from the log
+            self.bus.enable_pyramid(CHART_RANGES[self.chart_range])
+            if self.bus.pyramid is not None:
+                self.show_range()
+            else:
+                self.bus.pyramid_ready.connect(self.show_range)
         else:
-            self.change_label.setText("同步中...")
+            self.chart_range = "live"
+            self.chart.seed(self.bus.chart_seed())
+        # A cached price is shown as-is on the very first frame, without rolling in
+        if self.bus.latest is not None:
+            self.price_widget.setValue(f"¥{self.bus.latest.get('price', '0.00')}", animate=False)
+        self.bus.subscribe(self.update_price, self.handle_error)
 
     def init_ui(self) -> None:
         """Initialize a sleek iOS-like UI with pure black background."""
+        # One frame clock drives every animation in this window
+        self.clock = FrameClock(self)
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
         self.central_widget.setStyleSheet("background-color: #000000;")
+        # Everything lives on an opaque scene that drifts inside the central widget
+        self.scene = DriftScene(self.central_widget)
         
-        self.main_layout = QVBoxLayout(self.central_widget)
+        self.main_layout = QVBoxLayout(self.scene)
         
         # Adjust layout for preview mode (very small window)
         if self.is_preview:
@@ -331,12 +2300,14 @@ class ScreenSaverWindow(QMainWindow):
         self.header_layout.addWidget(self.time_label)
         
         # Price Area
-        self.price_widget = RollingNumber(font_size=price_size)
+        # "widgets" selects the original one-widget-per-character renderer
+        number_cls = RollingNumber if setting("price/renderer", "composite") == "widgets" else CompositeRollingNumber
+        self.price_widget = number_cls(font_size=price_size, clock=self.clock)
         if self.is_preview:
             self.price_widget.setFixedHeight(50)
         
         # Trend Chart
-        self.chart = TrendChart()
+        self.chart = TrendChart(clock=self.clock)
         if self.is_preview:
             self.chart.setMinimumHeight(40)
         
@@ -348,9 +2319,15 @@ class ScreenSaverWindow(QMainWindow):
         self.disclaimer_label = QLabel("数据仅供参考")
         self.disclaimer_label.setStyleSheet(f"color: #222222; font-size: {8 if self.is_preview else 14}px;")
         
+        # Rolling high/low/averages/volatility, session open and time-weighted average
+        self.stats_label = QLabel()
+        self.stats_label.setStyleSheet("color: #555555; font-size: 16px;")
+        
         self.info_layout.addWidget(self.change_label)
         self.info_layout.addStretch()
         if not self.is_preview:
+            self.info_layout.addWidget(self.stats_label, alignment=Qt.AlignmentFlag.AlignBottom)
+            self.info_layout.addSpacing(24)
             self.info_layout.addWidget(self.disclaimer_label, alignment=Qt.AlignmentFlag.AlignBottom)
         
         self.main_layout.addLayout(self.header_layout)
@@ -360,6 +2337,27 @@ class ScreenSaverWindow(QMainWindow):
         self.main_layout.addWidget(self.chart)
         self.main_layout.addLayout(self.info_layout)
 
+        # Render quality follows window size and measured frame times unless pinned
+        pinned = setting("quality/tier", "auto")
+        self.governor = QualityGovernor(
+            self, self.clock, pinned=next((i for i, t in enumerate(QUALITY_TIERS) if t.name == pinned), None))
+        self.governor.changed.connect(self.apply_quality)
+        self.apply_quality(self.governor.tier)
+
+        # Anti-burn-in drift (not in the tiny preview)
+        amplitude = 0 if self.is_preview else int(setting("drift/amplitude", 24))
+        self.drift = SceneDrift(self.central_widget, self.scene, amplitude)
+        self.drift.moved.connect(self._schedule_mirror)
+
+        if METRICS.enabled and not self.is_preview:
+            self.debug_overlay = DebugOverlay(self.central_widget)
+            self.debug_overlay.move(8, 8)
+
+    def show_range(self) -> None:
+        """Show the selected long-range view from the bus's pyramid."""
+        budget = max(self.chart.width(), 100)
+        self.chart.setSeries(self.bus.pyramid.query(CHART_RANGES[self.chart_range], budget))
+
     def update_price(self, data: Dict[str, Any]) -> None:
         """Update the UI with rolling numbers and chart."""
         price_str = data.get("price", "0.00")
@@ -369,7 +2367,10 @@ class ScreenSaverWindow(QMainWindow):
         self.price_widget.setValue(f"¥{price_str}")
         
         # Update chart
-        self.chart.addData(price_val)
+        if self.chart_range == "live":
+            self.chart.addData(price_val)
+        elif self.bus.pyramid is not None:
+            self.show_range()
         
         # Update change info
         rate = data.get("upAndDownRate", "+0.00%")
@@ -381,31 +2382,101 @@ class ScreenSaverWindow(QMainWindow):
         self.change_label.setText(f"{indicator} {rate}  {amt}")
         self.change_label.setStyleSheet(f"color: {color}; font-size: 36px; font-weight: 600;")
         self.time_label.setText(time.strftime('%H:%M:%S'))
+        self.update_indicators()
+        self._schedule_mirror()
+
+    def update_indicators(self) -> None:
+        ind = self.bus.indicators
+        if not len(ind):
+            return
+        self.chart.setLevels(open=ind.session_open, ma=ind.sma)
+        if not self.is_preview:
+            self.stats_label.setText(
+                f"高 {ind.high:.2f}  低 {ind.low:.2f}  均 {ind.sma:.2f}  EMA {ind.ema:.2f}  "
+                f"σ {ind.stdev:.2f}  开 {ind.session_open:.2f}  时均 {ind.twap:.2f}")
 
     def handle_error(self, error_msg: str) -> None:
         self.change_label.setText("数据同步中...")
         self.change_label.setStyleSheet("color: #333333; font-size: 24px;")
+        self._schedule_mirror()
 
-    def _poll_cursor(self) -> None:
-        if self.is_preview or self._exiting:
-            return
-        pos = QCursor.pos()
-        if self._cursor_last_pos is None:
-            self._cursor_last_pos = pos
+    def apply_quality(self, tier: QualityTier) -> None:
+        self.clock.setInterval(1000 // tier.fps)
+        self.price_widget.setRollDuration(tier.roll_ms)
+        self.chart._series_tween.duration_ms = tier.chart_ms
+        self.chart.antialias = tier.antialias
+        self.chart.max_points = tier.chart_points
+        self.chart.update()
+
+    def render_offscreen(self) -> "MirrorWindow":
+        """Take the scene off screen and show it through a MirrorWindow on this screen too.
+
+        From then on the scene is rendered once per frame, into mirror_frame, and every
+        screen including this one only blits that frame.
+        """
+        if self.primary_view is None:
+            geometry = self.geometry()
+            self.hide()
+            self.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+            self.setGeometry(geometry)
+            self.show()
+            self.primary_view = MirrorWindow(self)
+            self.primary_view.setGeometry(geometry)
+            if not self.is_preview:
+                InputWatcher.instance().watch(self.primary_view)
+            self.primary_view.showFullScreen()
+            self._mirror_refresh.start()
+        return self.primary_view
+
+    def closeEvent(self, event) -> None:
+        if self.primary_view is not None:
+            self.primary_view.close()
+        super().closeEvent(event)
+
+    def add_mirror(self, mirror: QWidget) -> None:
+        if not self._mirrors:
+            self.clock.frame.connect(self._schedule_mirror)
+        self._mirrors.append(mirror)
+        self._schedule_mirror()
+
+    def remove_mirror(self, mirror: QWidget) -> None:
+        if mirror in self._mirrors:
+            self._mirrors.remove(mirror)
+            if not self._mirrors:
+                self.clock.frame.disconnect(self._schedule_mirror)
+                self.mirror_frame = None
+
+    def _schedule_mirror(self) -> None:
+        # Coalesce everything that changed during this event-loop pass into one snapshot
+        if self._mirrors and not self._mirror_pending:
+            self._mirror_pending = True
+            QTimer.singleShot(0, self._render_mirror)
+
+    def _render_mirror(self) -> None:
+        self._mirror_pending = False
+        if not self._mirrors:
             return
-        if pos != self._cursor_last_pos:
-            self.close_and_exit()
+        # Render into the same opaque pixmap every frame; grab() would allocate a new one
+        scene = self.central_widget
+        dpr = scene.devicePixelRatioF()
+        size = QSize(round(scene.width() * dpr), round(scene.height() * dpr))
+        frame = self.mirror_frame
+        if frame is None or frame.size() != size or frame.devicePixelRatio() != dpr:
+            frame = QPixmap(size)
+            frame.setDevicePixelRatio(dpr)
+            frame.fill(QColor("#000000"))
+        scene.render(frame)
+        self.mirror_frame = frame
+        for mirror in self._mirrors:
+            mirror.update()
 
     def close_and_exit(self) -> None:
-        """Safely stop all worker threads and force terminate the process."""
+        """Stop the worker and leave the event loop; force the exit only if the worker hangs."""
         if self._exiting:
             return
         self._exiting = True
 
-        # 1. Stop all timers and hide ALL windows immediately
-        if hasattr(self, "_cursor_timer"):
-            self._cursor_timer.stop()
-            
+        # 1. Hide ALL windows immediately
         for widget in QApplication.topLevelWidgets():
             if isinstance(widget, QWidget):
                 widget.hide()
@@ -414,46 +2485,221 @@ class ScreenSaverWindow(QMainWindow):
         # 2. Process events to ensure windows are removed from screen
         QApplication.processEvents()
 
-        # 3. Stop worker thread
-        if hasattr(self, "worker") and self.worker.isRunning():
-            self.worker.stop()
-            self.worker.wait(300)
+        # 3. Stop the shared worker thread. An in-flight request is aborted, so this
+        #    normally returns within milliseconds; the timeout only covers a connect
+        #    that is still resolving. The tick log is flushed and closed either way.
+        stopped = self.bus.stop(300)
+        if METRICS.enabled:
+            METRICS.dismiss_ms = InputWatcher.instance().exit_latency_ms()
+            METRICS.write()
 
-        # 4. Final aggressive exit
-        # Using os._exit(0) to bypass any PySide cleanup hangs
-        os._exit(0)
+        # 4. Normal exit through app.exec() returning; a worker still stuck in a
+        #    connect would block interpreter shutdown, so only then force it
+        if stopped:
+            QApplication.quit()
+        else:
+            os._exit(0)
+
+class MirrorWindow(QWidget):
+    """Fullscreen secondary screen that shows a scaled copy of a primary window's scene.
 
-    # --- Screen Saver Exit Triggers ---
+    It owns no widget tree, animations or timers; the primary renders its scene once
+    per frame into a shared pixmap and this window only blits it. Once mirroring starts
+    the primary's own screen is a MirrorWindow too (see render_offscreen).
+    """
+    def __init__(self, source: "ScreenSaverWindow") -> None:
+        super().__init__()
+        self.source = source
+        self.setWindowTitle("实时金价windows屏保")
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint
+            | Qt.WindowType.WindowStaysOnTopHint
+            | Qt.WindowType.Tool
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setCursor(Qt.CursorShape.BlankCursor)
+        source.add_mirror(self)
+
+    def closeEvent(self, event) -> None:
+        self.source.remove_mirror(self)
+        super().closeEvent(event)
+
+    @timed_paint
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        frame = self.source.mirror_frame
+        if frame is None or frame.isNull():
+            painter.fillRect(self.rect(), QColor("#000000"))
+            return
+        native = QSizeF(frame.size()) / frame.devicePixelRatio()
+        if native == QSizeF(self.size()) and frame.devicePixelRatio() == self.devicePixelRatioF():
+            # Same size and DPR (always the case on the primary's own screen): a plain copy
+            painter.drawPixmap(0, 0, frame)
+            return
+        # Scale to fit, keeping the primary's aspect ratio, and black out the bars
+        size = native.scaled(QSizeF(self.size()), Qt.AspectRatioMode.KeepAspectRatio)
+        target = QRectF(QPointF((self.width() - size.width()) / 2, (self.height() - size.height()) / 2), size)
+        if size != QSizeF(self.size()):
+            painter.fillRect(self.rect(), QColor("#000000"))
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmap(target, frame, QRectF(frame.rect()))
+
+def can_mirror(source: QScreen, screen: QScreen, max_dpr_delta: float = 0.25, max_aspect_delta: float = 0.05) -> bool:
+    """True unless the screen's DPR or aspect ratio differ noticeably from the source's."""
+    if abs(source.devicePixelRatio() - screen.devicePixelRatio()) > max_dpr_delta:
+        return False
+    a, b = source.geometry(), screen.geometry()
+    aspect_a, aspect_b = a.width() / max(a.height(), 1), b.width() / max(b.height(), 1)
+    return abs(aspect_a - aspect_b) <= aspect_a * max_aspect_delta
+
+class ConfigDialog(QDialog):
+    """Settings dialog shown for /c."""
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("设置")
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("数据自动同步自京东金融。"))
+
+        row = QHBoxLayout()
+        row.addWidget(QLabel("趋势图范围:"))
+        self.range_box = QComboBox()
+        for key, label in CHART_RANGE_LABELS.items():
+            self.range_box.addItem(label, key)
+        self.range_box.setCurrentIndex(max(0, self.range_box.findData(setting("chart/range", "live"))))
+        row.addWidget(self.range_box)
+        layout.addLayout(row)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def accept(self) -> None:
+        save_setting("chart/range", self.range_box.currentData())
+        super().accept()
+
+def open_price_bus() -> PriceBus:
+    """PriceBus backed by the on-disk tick log and shared cache, warmed from them.
+
+    feed/source selects the feed: "live", "record" (live, appended to feed/capture) or
+    "replay" (feed/capture played back at feed/speed, a multiplier or "max"; feed/loop
+    restarts it). A replay leaves the tick log and the shared cache alone.
+    """
+    feed = setting("feed/source", "live")
+    capture = setting("feed/capture", "") or os.path.join(app_data_dir(), "capture.jsonl")
+    if feed == "replay":
+        speed = str(setting("feed/speed", "1"))
+        loop = str(setting("feed/loop", "0")).lower() in ("1", "true")
+        return PriceBus(source=ReplaySource(capture, 0.0 if speed == "max" else float(speed), loop))
+
+    try:
+        store = TickStore(os.path.join(app_data_dir(), "ticks"))
+    except OSError:
+        store = None
+    try:
+        cache = SharedPriceCache(app_data_dir(), ttl=float(setting("cache/ttl", 4.0)))
+    except OSError:
+        cache = None
+    source = RecordingSource(LiveSource(cache=cache), capture) if feed == "record" else None
+    bus = PriceBus(store, cache, source=source)
+    bus.warm_start()
+    return bus
+
+def embed_preview(window: QWidget, parent_hwnd: int) -> None:
+    """Make the window a child of the Screen Saver settings dialog's preview area."""
+    import ctypes
+    from ctypes import wintypes
+
+    # 1. Get client area of the preview monitor in settings dialog
+    rect = wintypes.RECT()
+    ctypes.windll.user32.GetClientRect(parent_hwnd, ctypes.byref(rect))
     
-    def keyPressEvent(self, event: QKeyEvent) -> None:
-        if not self.is_preview:
-            self.close_and_exit()
-        super().keyPressEvent(event)
+    # 2. Force the window to be a child of the settings dialog
+    window.show() # Create winId
+    ctypes.windll.user32.SetParent(int(window.winId()), parent_hwnd)
+    
+    # 3. Modify window style to be a child (WS_CHILD)
+    GWL_STYLE = -16
+    WS_CHILD = 0x40000000
+    style = ctypes.windll.user32.GetWindowLongW(int(window.winId()), GWL_STYLE)
+    ctypes.windll.user32.SetWindowLongW(int(window.winId()), GWL_STYLE, style | WS_CHILD)
+    
+    # 4. Resize to fit the preview area
+    window.setGeometry(0, 0, rect.right, rect.bottom)
+    
+    # 5. Monitor parent window - if it's gone, we exit
+    timer = QTimer(window)
+    timer.timeout.connect(lambda: os._exit(0) if not ctypes.windll.user32.IsWindow(parent_hwnd) else None)
+    timer.start(1000)
 
-    def mousePressEvent(self, event: QMouseEvent) -> None:
-        if not self.is_preview:
-            self.close_and_exit()
-        super().mousePressEvent(event)
+class FirstFrameStart(QObject):
+    """Calls start() once `window` is first exposed, or after fallback_ms at the latest.
 
-    def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        if not self.is_preview:
-            # Capture initial position to avoid exit on first fake move event
-            current_pos = event.globalPosition().toPoint()
-            if self.last_mouse_pos is None:
-                self.last_mouse_pos = current_pos
-                return
-            
-            # Exit on any intentional movement (>2 pixels)
-            if (current_pos - self.last_mouse_pos).manhattanLength() > 2:
-                self.close_and_exit()
-        super().mouseMoveEvent(event)
+    A zero-delay timer queued before app.exec() can fire before the first expose, so
+    whatever start() imports (the HTTP stack) would compete with the first frame.
+    """
+    def __init__(self, window: QWidget, start: Callable[[], None], fallback_ms: int = 500) -> None:
+        super().__init__(window)
+        self._start: Optional[Callable[[], None]] = start
+        window.winId()  # Make sure the native window exists
+        window.windowHandle().installEventFilter(self)
+        QTimer.singleShot(fallback_ms, self, self._fire)  # e.g. a window that is never shown
+
+    def eventFilter(self, obj: QObject, event) -> bool:
+        if event.type() == QEvent.Type.Expose and self._start is not None:
+            # The expose is painted synchronously; start on the next loop iteration
+            QTimer.singleShot(0, self, self._fire)
+        return False
+
+    def _fire(self) -> None:
+        start, self._start = self._start, None
+        if start is not None:
+            start()
+
+class StartupProbe(QObject):
+    """Reports import time and time-to-first-paint as one JSON line, then exits.
+
+    Enabled with GOLD_SAVER_STARTUP_PROBE=1; bench.py startup drives it for /s, /p and /c.
+    """
+    def __init__(self, mode: str, widget: QWidget, embedded: bool = False) -> None:
+        super().__init__(widget)
+        self.mode = mode
+        self.embedded = embedded  # /p inside a real host window, not standalone
+        self._exposed = False
+        self._requests_loaded = False
+        widget.winId()  # Make sure the native window exists
+        widget.windowHandle().installEventFilter(self)
+
+    def eventFilter(self, obj: QObject, event) -> bool:
+        if event.type() == QEvent.Type.Expose and not self._exposed:
+            self._exposed = True
+            # Sampled now: the deferred worker start may well run before _report
+            self._requests_loaded = "requests" in sys.modules
+            # The expose is painted synchronously; report on the next loop iteration
+            QTimer.singleShot(0, self._report)
+        return False
+
+    def _report(self) -> None:
+        import json
+        print(json.dumps({
+            "mode": self.mode,
+            "embedded": self.embedded,
+            "import_ms": (_IMPORTS_DONE - _T_START) * 1000,
+            "first_paint_ms": (time.perf_counter() - _T_START) * 1000,
+            "requests_loaded": self._requests_loaded,  # At the first expose
+        }), flush=True)
+        os._exit(0)
 
 def main():
-    # Recommended for frozen executables
-    import multiprocessing
-    multiprocessing.freeze_support()
+    # Recommended for frozen executables; not needed (and not imported) otherwise
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
     
     app = QApplication(sys.argv)
+    probe = os.environ.get("GOLD_SAVER_STARTUP_PROBE") == "1"
+    if str(setting("metrics/enabled", "0")).lower() in ("1", "true"):
+        METRICS.enable(os.path.join(app_data_dir(), "metrics.json"))
     
     # Handle Windows Screen Saver arguments
     # /s: Start the screensaver (Full screen)
@@ -470,7 +2716,9 @@ def main():
         elif arg.startswith("/s"): mode = "saver"
 
     if mode == "config":
-        QMessageBox.information(None, "设置", "实时金价屏保目前无需额外配置。\n数据每 5 秒自动同步自京东金融。")
+        dialog = ConfigDialog()
+        if probe: StartupProbe(mode, dialog)
+        dialog.exec()
         sys.exit(0)
 
     if mode == "preview":
@@ -484,58 +2732,71 @@ def main():
                 try: parent_hwnd = int(args[i+1])
                 except: pass
         
+        if not parent_hwnd and not probe:
+            # If no HWND or error, don't show anything in preview mode
+            os._exit(0)
+
+        bus = open_price_bus()
+        window = ScreenSaverWindow(bus, is_preview=True)
+        if probe:
+            StartupProbe(mode, window, embedded=bool(parent_hwnd))
         if parent_hwnd:
-            window = ScreenSaverWindow(is_preview=True)
             try:
-                # 1. Get client area of the preview monitor in settings dialog
-                rect = wintypes.RECT()
-                ctypes.windll.user32.GetClientRect(parent_hwnd, ctypes.byref(rect))
-                
-                # 2. Force the window to be a child of the settings dialog
-                window.show() # Create winId
-                ctypes.windll.user32.SetParent(int(window.winId()), parent_hwnd)
-                
-                # 3. Modify window style to be a child (WS_CHILD)
-                GWL_STYLE = -16
-                WS_CHILD = 0x40000000
-                style = ctypes.windll.user32.GetWindowLongW(int(window.winId()), GWL_STYLE)
-                ctypes.windll.user32.SetWindowLongW(int(window.winId()), GWL_STYLE, style | WS_CHILD)
-                
-                # 4. Resize to fit the preview area
-                window.setGeometry(0, 0, rect.right, rect.bottom)
-                
-                # 5. Monitor parent window - if it's gone, we exit
-                timer = QTimer(window)
-                timer.timeout.connect(lambda: os._exit(0) if not ctypes.windll.user32.IsWindow(parent_hwnd) else None)
-                timer.start(1000)
-                
-                sys.exit(app.exec())
+                embed_preview(window, parent_hwnd)
             except Exception:
                 os._exit(0)
         else:
-            # If no HWND or error, don't show anything in preview mode
-            os._exit(0)
+            # Probe without a host window: the same path at the usual preview-pane size
+            window.resize(152, 112)
+            window.show()
+        # As for /s: the worker's imports must not compete with the first frame
+        FirstFrameStart(window, bus.start)
+        sys.exit(app.exec())
 
-    # Multi-monitor support for 'saver' or 'run' mode
-    screens = app.screens()
-    windows = []
-    
-    for i, screen in enumerate(screens):
-        is_main = (i == 0)
-        # Only the first window runs the background worker
-        win = ScreenSaverWindow(is_preview=False, run_worker=is_main)
-        
+    # Multi-monitor support for 'saver' or 'run' mode: one fetcher feeds every screen
+    bus = open_price_bus()
+    windows: Dict[QScreen, QWidget] = {}
+    # "mirror": secondary screens show a scaled copy of the first window instead of
+    # rendering their own scene, unless their DPR or aspect ratio differ noticeably
+    mirror = setting("screens/mode", "independent") == "mirror"
+
+    def add_screen(screen: QScreen) -> None:
+        source = next(((s, w) for s, w in windows.items() if isinstance(w, ScreenSaverWindow)), None)
+        if mirror and source is not None and can_mirror(source[0], screen):
+            source[1].render_offscreen()  # First mirror: the source screen blits as well
+            win = MirrorWindow(source[1])
+            InputWatcher.instance().watch(win)
+        else:
+            win = ScreenSaverWindow(bus, is_preview=False)
+        if probe and not windows:
+            StartupProbe(mode, win)
         # Position the window on the specific screen
-        geom = screen.geometry()
-        win.setGeometry(geom)
-        
-        if not is_main:
-            # Secondary screens can show a simple black screen or a mirrored view
-            # For now, we'll just show the same UI but without its own API worker
-            pass
-            
+        win.setGeometry(screen.geometry())
         win.showFullScreen()
-        windows.append(win)
+        windows[screen] = win
+
+    def remove_screen(screen: QScreen) -> None:
+        win = windows.pop(screen, None)
+        if win is not None:
+            win.close()
+            win.deleteLater()
+        # Screens that mirrored the removed window get re-assigned
+        for other, mirror_win in list(windows.items()):
+            if isinstance(mirror_win, MirrorWindow) and mirror_win.source is win:
+                windows.pop(other)
+                mirror_win.close()
+                mirror_win.deleteLater()
+                add_screen(other)
+
+    for screen in app.screens():
+        add_screen(screen)
+    # Monitors hot-plugged while running get a window fed from the cached tick
+    app.screenAdded.connect(add_screen)
+    app.screenRemoved.connect(remove_screen)
+    # Start fetching once the first frame is up, so the worker's imports do not
+    # compete with it for the GIL
+    first = next(iter(windows.values()))
+    FirstFrameStart(getattr(first, "primary_view", None) or first, bus.start)
     
     sys.exit(app.exec())
 
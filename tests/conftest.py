@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Headless Qt, and keep the tests away from the real per-user data directory
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("GOLD_SAVER_DATA_DIR", tempfile.mkdtemp(prefix="gold-saver-tests-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,30 @@
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from main import TrendChart, column_extremes
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_column_extremes():
+    series = [3.0, 1.0, 4.0, 1.5, 5.0, 9.0, 2.0, 6.0]
+    assert list(column_extremes(series, 2)) == [1.0, 2.0, 4.0, 9.0]
+    assert list(column_extremes(series, 8)) == series + series
+
+
+def test_dense_history_is_drawn_as_a_band(app):
+    chart = TrendChart(capacity=10000)
+    chart.seed([float(i % 7) for i in range(50)])
+    points, band = chart._series_points(800, 300)
+    assert not band and len(points) == 50
+
+    # 800 px wide: one column per four pixels, whatever the history length
+    chart.seed([float(i % 7) for i in range(10000)])
+    points, band = chart._series_points(800, 300)
+    assert band and len(points) == 2 * 200
+    chart.max_points = 120
+    points, band = chart._series_points(800, 300)
+    assert band and len(points) == 120
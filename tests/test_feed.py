@@ -0,0 +1,110 @@
+import json
+
+from main import (FeedSource, GoldPriceWorker, MinMaxPyramid, POLL_CHANGED, PriceBus, RecordingSource,
+                  ReplaySource, TICK_TIME, parse_tick)
+
+
+class ListSource(FeedSource):
+    """Yields the given payloads, then finishes."""
+    realtime = False
+
+    def __init__(self, payloads) -> None:
+        self.payloads = list(payloads)
+
+    def poll(self):
+        payload = self.payloads.pop(0)
+        self.finished = not self.payloads
+        return payload, None
+
+    def next_delay(self, outcome: str) -> float:
+        return 0.0
+
+
+def run_worker(source: FeedSource) -> tuple:
+    """Run the worker loop on this thread; (payloads, errors) it emitted."""
+    worker = GoldPriceWorker(source=source)
+    received, errors = [], []
+    worker.data_received.connect(lambda payload: (received.append(payload), worker.acknowledge()))
+    worker.error_occurred.connect(errors.append)
+    worker.run()
+    return received, errors
+
+
+def test_missing_replay_capture_reports_an_error(tmp_path):
+    received, errors = run_worker(ReplaySource(str(tmp_path / "missing.jsonl")))
+    assert received == []
+    assert len(errors) == 1 and "missing.jsonl" in errors[0]
+
+
+def test_unwritable_capture_keeps_the_feed(tmp_path):
+    source = RecordingSource(ListSource([{"price": "1.00"}, {"price": "2.00"}]),
+                             str(tmp_path / "no-such-dir" / "capture.jsonl"))
+    received, errors = run_worker(source)
+    assert received == [{"price": "1.00"}, {"price": "2.00"}]
+    assert errors == [] and source.records == 0
+
+
+def test_recording_round_trips_through_replay(tmp_path):
+    path = str(tmp_path / "capture.jsonl")
+    payloads = [{"price": "1.00"}, {"price": "2.00"}, {"price": "2.00"}]
+    assert run_worker(RecordingSource(ListSource(payloads), path)) == (payloads, [])
+    replay = ReplaySource(path, speed=0.0)
+    received, errors = run_worker(replay)
+    assert [{k: v for k, v in p.items() if k != TICK_TIME} for p in received] == payloads
+    assert errors == [] and replay.next_delay(POLL_CHANGED) == 0.0
+
+
+def test_replay_plays_back_every_record_kind(tmp_path):
+    body = json.dumps({"success": True, "resultData": {"datas": {"price": "2000.00"}}})
+    records = [
+        {"t": 1.0, "status": 200, "body": body},
+        {"t": 2.0, "status": 304},
+        {"t": 3.0, "status": 500, "error": "HTTP 500"},
+        {"t": 4.0, "payload": {"price": "2001.00"}, "cached": True},
+        {"t": 5.0, "status": 200, "body": "not json"},
+    ]
+    path = tmp_path / "capture.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in records) + '{"t": 6.0, "sta', encoding="utf-8")
+
+    source = ReplaySource(str(path), speed=2.0)
+    source.open()
+    polled = []
+    while not source.finished:
+        polled.append((source.poll(), source.fresh, source.next_delay("changed")))
+    source.close()
+
+    assert [p[0] for p in polled] == [
+        ({"price": "2000.00", TICK_TIME: 1.0}, None),
+        ({"price": "2000.00", TICK_TIME: 2.0}, None),
+        (None, "HTTP 500"),
+        ({"price": "2001.00", TICK_TIME: 4.0}, None),
+        (None, "API 返回数据格式错误"),
+    ]
+    assert [p[1] for p in polled] == [True, True, True, False, True]
+    assert [p[2] for p in polled] == [0.5, 0.5, 0.5, 0.5, 0.0]
+
+
+def test_replay_ticks_keep_the_recorded_timeline(tmp_path):
+    path = tmp_path / "capture.jsonl"
+    path.write_text("".join(json.dumps({"t": 100.0 + 10 * i, "payload": {"price": str(2000 + i)}}) + "\n"
+                            for i in range(3)), encoding="utf-8")
+
+    # Looping continues the timeline instead of jumping back to the first record
+    source = ReplaySource(str(path), speed=0.0, loop=True)
+    source.open()
+    times = [parse_tick(source.poll()[0])[0] for _ in range(7)]
+    source.close()
+    assert times == [100.0, 110.0, 120.0, 120.0, 130.0, 140.0, 140.0]
+
+    # Indicators and the pyramid see capture time, not the time of the replay
+    runs = []
+    for _ in range(2):
+        bus = PriceBus(source=ReplaySource(str(path), speed=0.0))
+        pyramid = bus.pyramid = MinMaxPyramid()
+        source = bus.source
+        source.open()
+        while not source.finished:
+            bus._publish(source.poll()[0])
+        source.close()
+        runs.append((bus.indicators.twap, pyramid.levels[0][-1][0]))
+    assert runs[0] == runs[1] == ((2000 * 10 + 2001 * 10) / 20, 120.0)
@@ -0,0 +1,59 @@
+import math
+import random
+
+import pytest
+
+from main import StreamingIndicators, session_day
+
+# 100 s into a trading session, see session_day()
+SESSION_START = 20000 * 86400 - 12 * 3600
+
+
+def test_indicators_match_brute_force():
+    rng = random.Random(3)
+    window, span = 50, 20
+    indicators = StreamingIndicators(window, ema_span=span)
+    prices, times = [], []
+    t, price, ema = SESSION_START + 100, 2000.0, None
+    for _ in range(500):
+        t += rng.uniform(0.5, 10.0)
+        price += rng.gauss(0, 2)
+        prices.append(price)
+        times.append(t)
+        indicators.push(price, t)
+
+        recent = prices[-window:]
+        mean = sum(recent) / len(recent)
+        ema = price if ema is None else ema + 2.0 / (span + 1) * (price - ema)
+        assert indicators.high == max(recent)
+        assert indicators.low == min(recent)
+        assert indicators.sma == pytest.approx(mean, abs=1e-9)
+        assert indicators.stdev == pytest.approx(
+            math.sqrt(sum((p - mean) ** 2 for p in recent) / len(recent)), abs=1e-6)
+        assert indicators.ema == pytest.approx(ema)
+
+    held = [b - a for a, b in zip(times, times[1:])]
+    assert indicators.twap == pytest.approx(sum(p * d for p, d in zip(prices, held)) / sum(held))
+    assert indicators.session_open == prices[0]
+
+
+def test_new_session_resets_open_and_twap():
+    indicators = StreamingIndicators(10)
+    indicators.push(100.0, SESSION_START + 10)
+    indicators.push(110.0, SESSION_START + 20)
+    next_session = SESSION_START + 86400
+    assert session_day(next_session) == session_day(SESSION_START) + 1
+    indicators.push(120.0, next_session + 5)
+    assert indicators.session_open == 120.0
+    assert indicators.twap == 120.0
+    assert indicators.high == 120.0 and indicators.low == 100.0
+
+
+def test_stdev_keeps_precision_far_from_zero():
+    indicators = StreamingIndicators(4)
+    for price in (1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16, 1e9 + 4, 1e9 + 7):
+        indicators.push(price, SESSION_START + 1)
+    window = [13.0, 16.0, 4.0, 7.0]
+    mean = sum(window) / 4
+    assert indicators.sma == pytest.approx(1e9 + mean, abs=1e-6)
+    assert indicators.stdev == pytest.approx(math.sqrt(sum((p - mean) ** 2 for p in window) / 4), abs=1e-6)
@@ -0,0 +1,62 @@
+import random
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from main import MinMaxPyramid, PriceBus, TickStore
+
+
+def test_pyramid_extremes_match_buckets():
+    rng = random.Random(5)
+    pyramid = MinMaxPyramid(bucket_seconds=(0, 30), depth=1000)
+    ticks = [(float(t), 2000.0 + rng.gauss(0, 5)) for t in range(600)]
+    for t, price in ticks:
+        pyramid.append(t, price)
+
+    # Enough budget for every tick: the raw level
+    assert pyramid.query(600, 1000) == [price for _, price in ticks]
+
+    # Too small for raw ticks: one (low, high) pair per 30 s bucket, in time order
+    expected = []
+    for start in range(0, 600, 30):
+        bucket = ticks[start:start + 30]
+        low = min(bucket, key=lambda tick: tick[1])
+        high = max(bucket, key=lambda tick: tick[1])
+        expected += [tick[1] for tick in sorted((low, high))]
+    decimated = pyramid.query(600, 100)
+    assert decimated == expected
+    assert max(decimated) == max(price for _, price in ticks)
+    assert min(decimated) == min(price for _, price in ticks)
+
+
+def test_pyramid_skips_levels_that_dropped_the_range():
+    pyramid = MinMaxPyramid(bucket_seconds=(0, 60), depth=100)
+    for t in range(1000):
+        pyramid.append(float(t), float(t))
+    # The raw level only holds the last 100 ticks, so a 900 s range needs the 60 s level
+    prices = pyramid.query(900, 1000)
+    assert prices[0] <= 100.0 and prices[-1] == 999.0
+
+
+def test_bus_seeds_the_pyramid_off_the_gui_thread(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    now = time.time()
+    store = TickStore(str(tmp_path), segment_records=1000)
+    for i in range(3000):
+        store.append((now - 3010 + i, 2000.0 + i % 50, 0.0, 0.0))
+    bus = PriceBus(store=store)
+    ready = []
+    bus.pyramid_ready.connect(lambda: ready.append(bus.pyramid))
+
+    bus.enable_pyramid(3600)
+    # Published before the seed lands: kept, and not counted twice once it does
+    bus._publish({"price": "2100.00", "_tickTime": now - 1})
+    bus._publish({"price": "2101.00", "_tickTime": now})
+    deadline = time.monotonic() + 5
+    while not ready and time.monotonic() < deadline:
+        app.processEvents()
+    store.close()
+
+    assert ready == [bus.pyramid]
+    raw = [bucket[1] for bucket in bus.pyramid.levels[0]]
+    assert len(raw) == 3002 and raw[-2:] == [2100.0, 2101.0]
@@ -0,0 +1,73 @@
+import random
+
+from main import AdaptivePollScheduler, POLL_CHANGED, POLL_ERROR, POLL_UNCHANGED
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_scheduler(clock=None, trading=True, **kwargs) -> AdaptivePollScheduler:
+    return AdaptivePollScheduler(clock=clock or FakeClock(), trading_hours=lambda: trading,
+                                 rng=random.Random(7), **kwargs)
+
+
+def test_error_backoff_stays_within_bounds():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, interval=5.0, max_backoff=300.0, max_per_minute=1000)
+    for errors in range(1, 30):
+        delay = scheduler.next_delay(POLL_ERROR)
+        assert 5.0 <= delay <= min(300.0, 5.0 * 2 ** errors)
+        clock.now += delay
+
+
+def test_changed_price_resets_to_base_interval():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, interval=5.0, jitter=0.2, max_per_minute=1000)
+    for _ in range(10):
+        clock.now += scheduler.next_delay(POLL_UNCHANGED)
+    delay = scheduler.next_delay(POLL_CHANGED)
+    assert 4.0 <= delay <= 6.0
+
+
+def test_idle_growth_is_capped_by_session():
+    for trading, cap in ((True, 60.0), (False, 300.0)):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, trading=trading, interval=5.0, idle_interval=60.0,
+                                   closed_interval=300.0, jitter=0.2, max_per_minute=1000)
+        delays = []
+        for _ in range(40):
+            delays.append(scheduler.next_delay(POLL_UNCHANGED))
+            clock.now += delays[-1]
+        assert max(delays) <= cap * 1.2
+        assert delays[-1] >= cap * 0.8
+
+
+def test_per_minute_cap_holds_over_any_window():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, interval=1.0, jitter=0.0, max_per_minute=12)
+    polls = []
+    for outcome in [POLL_CHANGED, POLL_ERROR] * 100:
+        polls.append(clock.now)
+        clock.now += scheduler.next_delay(outcome)
+    # The capped poll lands exactly one minute after the oldest, give or take rounding
+    for i, start in enumerate(polls):
+        assert sum(1 for t in polls[i:] if t - start < 60.0 - 1e-6) <= 12
+
+
+def test_closed_hours_never_poll_faster_than_closed_interval():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, trading=False, interval=5.0, closed_interval=300.0,
+                               max_backoff=60.0, jitter=0.2, max_per_minute=1000)
+    for outcome in [POLL_CHANGED, POLL_ERROR, POLL_ERROR, POLL_UNCHANGED, POLL_CHANGED] * 4:
+        delay = scheduler.next_delay(outcome)
+        assert delay >= 300.0 * 0.8
+        clock.now += delay
+
+    # Back in trading hours a change snaps straight back to the base interval
+    scheduler.trading_hours = lambda: True
+    assert scheduler.next_delay(POLL_CHANGED) <= 5.0 * 1.2
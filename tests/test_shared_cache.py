@@ -0,0 +1,54 @@
+import os
+
+from main import PriceBus, SharedPriceCache, TICK_RECORD, TickStore
+
+
+def tick(i: int) -> tuple:
+    return (1000.0 + i, 2000.0 + i, 1.0, 0.05)
+
+
+def test_shared_cache_ttl_and_lock(tmp_path):
+    first, second = SharedPriceCache(str(tmp_path), ttl=60.0), SharedPriceCache(str(tmp_path), ttl=60.0)
+    assert first.read() is None and not first.is_fresh(None)
+    first.write({"price": "2000.00"}, etag='"a"')
+    entry = second.read()
+    assert entry["payload"] == {"price": "2000.00"} and entry["etag"] == '"a"'
+    assert second.is_fresh(entry)
+    assert not SharedPriceCache(str(tmp_path), ttl=0.0).is_fresh(entry)
+
+    assert first.try_lock()
+    assert not second.try_lock()
+    first.unlock()
+    assert second.try_lock()
+    second.unlock()
+
+
+def test_stores_sharing_a_directory_continue_each_other(tmp_path):
+    stores = [TickStore(str(tmp_path), segment_records=7, max_segments=100) for _ in range(2)]
+    for i in range(40):
+        stores[i % 2].append(tick(i))
+    for store in stores:
+        store.close()
+    sizes = [os.path.getsize(tmp_path / name) // TICK_RECORD.size
+             for name in sorted(os.listdir(tmp_path)) if name.endswith(".bin")]
+    assert sizes == [7, 7, 7, 7, 7, 5]
+    assert stores[0].tail(100) == [tick(i) for i in range(40)]
+
+
+def test_warm_start_seeds_every_logged_tick_when_the_cache_is_newer(tmp_path):
+    store = TickStore(str(tmp_path / "ticks"))
+    for i in range(3):
+        store.append(tick(i))  # Logged long ago, at t=1000..1002
+    cache = SharedPriceCache(str(tmp_path))
+
+    bus = PriceBus(store=store)
+    bus.warm_start()
+    assert bus.latest["price"] == "2002.00"
+    assert bus.chart_seed() == [2000.0, 2001.0]  # The newest arrives through subscribe()
+
+    cache.write({"price": "2010.00"})
+    bus = PriceBus(store=store, cache=cache)
+    bus.warm_start()
+    assert bus.latest == {"price": "2010.00"}
+    assert bus.chart_seed() == [2000.0, 2001.0, 2002.0]
+    store.close()
@@ -0,0 +1,35 @@
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import main
+from bench import slow_server
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_dismiss_during_a_slow_fetch_exits_promptly(app, monkeypatch):
+    server, requested, release = slow_server(10.0)
+    try:
+        bus = main.PriceBus(url=f"http://127.0.0.1:{server.server_address[1]}/")
+        window = main.ScreenSaverWindow(bus)
+        bus.start()
+        assert requested.wait(5.0), "the worker never reached the slow server"
+
+        forced, quits = [], []
+        monkeypatch.setattr(main.os, "_exit", forced.append)
+        monkeypatch.setattr(main.QApplication, "quit", lambda: quits.append(True))
+        started = time.perf_counter()
+        window.close_and_exit()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        assert not bus.worker.isRunning()
+        assert forced == [] and quits == [True]
+        assert elapsed_ms < 100
+    finally:
+        release.set()
+        server.shutdown()
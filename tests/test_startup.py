@@ -0,0 +1,36 @@
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication, QWidget
+
+from main import FirstFrameStart
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def pump_until(app, condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+
+
+def test_starts_after_the_first_expose(app):
+    window, started = QWidget(), []
+    FirstFrameStart(window, lambda: started.append(time.monotonic()), fallback_ms=60000)
+    app.processEvents()
+    assert started == []  # Not before the window is on screen
+    window.show()
+    pump_until(app, lambda: started)
+    window.close()
+    assert len(started) == 1
+
+
+def test_falls_back_when_never_exposed(app):
+    window, started = QWidget(), []
+    FirstFrameStart(window, lambda: started.append(True), fallback_ms=50)
+    pump_until(app, lambda: started)
+    pump_until(app, lambda: len(started) > 1, timeout=0.2)
+    assert started == [True]
@@ -0,0 +1,38 @@
+import os
+
+from main import TICK_RECORD, TickStore
+
+
+def tick(i: int) -> tuple:
+    return (1000.0 + i, 2000.0 + i, 1.0, 0.05)
+
+
+def segment_sizes(directory: str) -> list:
+    return [os.path.getsize(os.path.join(directory, name)) // TICK_RECORD.size
+            for name in sorted(os.listdir(directory)) if name.endswith(".bin")]
+
+
+def test_segments_rotate_and_prune(tmp_path):
+    store = TickStore(str(tmp_path), segment_records=10, max_segments=3)
+    for i in range(35):
+        store.append(tick(i))
+    store.close()
+    assert segment_sizes(str(tmp_path)) == [10, 10, 5]
+    assert store.tail(100) == [tick(i) for i in range(10, 35)]
+    assert store.tail(3) == [tick(i) for i in range(32, 35)]
+
+
+def test_torn_record_is_dropped(tmp_path):
+    store = TickStore(str(tmp_path), segment_records=100)
+    for i in range(5):
+        store.append(tick(i))
+    store.close()
+    (segment,) = [name for name in os.listdir(tmp_path) if name.endswith(".bin")]
+    with open(tmp_path / segment, "ab") as f:
+        f.write(TICK_RECORD.pack(*tick(5))[:13])  # A process killed mid-write
+    assert TickStore(str(tmp_path)).tail(10) == [tick(i) for i in range(5)]
+
+    store = TickStore(str(tmp_path), segment_records=100)
+    store.append(tick(6))
+    store.close()
+    assert store.tail(10) == [tick(i) for i in range(5)] + [tick(6)]